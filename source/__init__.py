@@ -2,6 +2,11 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 
+import time
+
+_time_import = time.perf_counter()
+
+
 if "bpy" in locals():
     from . import var
     essentials.reload_recursive(var.ADDON_DIR, locals())
@@ -9,13 +14,33 @@ else:
     import bpy
     from bpy.props import PointerProperty
 
-    from . import essentials, localization, onscreen, operators, preferences, ui
+    from . import essentials, localization, onscreen, operators, preferences, ui, var
 
 
+var.Startup["import"] = time.perf_counter() - _time_import
 classes = essentials.get_classes((preferences, operators, ui))
+_cli_command = None
+_msgbus_owner = object()
+
+
+def _translations_register() -> None:
+    """Register catalog of active locale only, others are loaded when interface language changes"""
+    locale = bpy.app.translations.locale
+    bpy.app.translations.unregister(__name__)
+
+    if (catalog := localization.load(locale)) is not None:
+        bpy.app.translations.register(__name__, {locale: catalog})
+
+
+def _cli_execute(argv: list[str]) -> int:
+    # Command line module is only needed when the command runs
+    from . import cli
+    return cli.execute(argv)
 
 
 def register():
+    time_start = time.perf_counter()
+
     for cls in classes:
         bpy.utils.register_class(cls)
 
@@ -37,10 +62,25 @@ def register():
 
     onscreen.handler_add()
 
+    # Command line
+    # ---------------------------
+
+    global _cli_command
+    _cli_command = bpy.utils.register_cli_command("sidekick", _cli_execute)
+
     # Translations
     # ---------------------------
 
-    bpy.app.translations.register(__name__, localization.DICTIONARY)
+    _translations_register()
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.PreferencesView, "language"),
+        owner=_msgbus_owner,
+        args=(),
+        notify=_translations_register,
+        options={"PERSISTENT"},
+    )
+
+    var.Startup["register"] = time.perf_counter() - time_start
 
 
 def unregister():
@@ -65,10 +105,17 @@ def unregister():
 
     onscreen.handler_del()
 
+    # Command line
+    # ---------------------------
+
+    bpy.utils.unregister_cli_command(_cli_command)
+
     # Translations
     # ---------------------------
 
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
     bpy.app.translations.unregister(__name__)
+    localization.clear()
 
 
 if __name__ == "__main__":
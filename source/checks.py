@@ -0,0 +1,639 @@
+# SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Detection engine, runs on snapshot records and must not import bpy
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from functools import wraps
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from . import problemlib
+from .snapshot import CollectionRecord, CurveRecord, MeshGeometry, MeshRecord, ModifierRecord, ObjectRecord, Snapshot
+
+# Vertices closer than this are coincident, faces smaller than its square have zero area
+MERGE_DISTANCE = 1e-5
+
+# Unit vector with irrational ratios, vertices of axis aligned grids do not share projections
+_DOUBLES_AXIS = np.array((1.0, 2.0 ** 0.5, 3.0 ** 0.5)) / 6.0 ** 0.5
+
+# Faces per batch, bounds temporary memory on dense meshes
+_CHUNK = 1 << 16
+
+GEOMETRY_CHECKS = frozenset({
+    problemlib.ID_MESH_ZERO_AREA,
+    problemlib.ID_MESH_LOOSE_VERTS,
+    problemlib.ID_MESH_LOOSE_EDGES,
+    problemlib.ID_MESH_DOUBLES,
+    problemlib.ID_MESH_NON_MANIFOLD,
+})
+
+
+def _is_mod_solidify(modifiers: Iterable[ModifierRecord]) -> bool:
+    for mod in modifiers:
+        if mod.type == "SOLIDIFY":
+            return True
+    return False
+
+
+def scaled_mask(scale: np.ndarray) -> np.ndarray:
+    """Return scaled state for (N, 3) float32 array of object scales"""
+    # Match mathutils precision: float products accumulated in double, sum returned as float
+    sq = np.square(scale).astype(np.float64)
+    length_squared = (sq[:, 0] + sq[:, 1] + sq[:, 2]).astype(np.float32)
+    return np.abs(length_squared.astype(np.float64) - 3.0) > 1e-6
+
+
+def is_scaled(scale: Iterable[float]) -> bool:
+    return bool(scaled_mask(np.array((tuple(scale),), dtype=np.float32))[0])
+
+
+def find_cycles(graph: dict[int, frozenset[int]]) -> set[int]:
+    """Return UIDs of objects in dependency cycles, iterative Tarjan's
+    strongly connected components algorithm, O(V+E)"""
+    order = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    cyclic = set()
+
+    for root in graph:
+        if root in order:
+            continue
+
+        order[root] = low[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            node, edges = work[-1]
+
+            for child in edges:
+                if child not in order:
+                    order[child] = low[child] = len(order)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph.get(child, ()))))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], order[child])
+
+            else:
+                work.pop()
+
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        x = stack.pop()
+                        on_stack.discard(x)
+                        component.append(x)
+                        if x == node:
+                            break
+
+                    if len(component) > 1 or node in graph.get(node, ()):
+                        cyclic.update(x >> 1 for x in component)
+
+    return cyclic
+
+
+# Mesh geometry
+# ----------------------------
+
+
+def _memoized(code: int) -> Callable:
+    """Compute result once per mesh geometry, missing geometry is not checked"""
+
+    def decorator(func: Callable[[MeshGeometry], bool]) -> Callable[[MeshRecord], bool]:
+
+        @wraps(func)
+        def check(me: MeshRecord) -> bool:
+            if (geo := me.geometry) is None:
+                return False
+            if (result := geo.memo.get(code)) is None:
+                result = geo.memo[code] = bool(func(geo))
+            return result
+
+        return check
+
+    return decorator
+
+
+def has_zero_area(geo: MeshGeometry) -> bool:
+    """Face area from triangle fan around first corner, summed cross products
+    give doubled area vector of planar and non-planar faces alike"""
+    sizes = geo.face_sizes
+    ends = np.cumsum(sizes)
+    area_min = (2.0 * MERGE_DISTANCE ** 2) ** 2
+
+    for i in range(0, len(sizes), _CHUNK):
+        n = sizes[i:i + _CHUNK]
+        start = ends[i] - sizes[i]
+        end = ends[i + len(n) - 1]
+        firsts = ends[i:i + _CHUNK] - n - start
+
+        # Offsets from first corner are small, float64 keeps cross products of degenerate faces exact
+        co = np.take(geo.co, geo.corner_verts[start:end], axis=0)
+        a = (co - np.repeat(co[firsts], n, axis=0)).astype(np.float64)
+        nxt = np.arange(1, end - start + 1)
+        nxt[firsts + n - 1] = firsts  # Last corner wraps to first
+        b = np.take(a, nxt, axis=0)
+
+        x = np.add.reduceat(a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1], firsts)
+        y = np.add.reduceat(a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2], firsts)
+        z = np.add.reduceat(a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0], firsts)
+
+        if (x * x + y * y + z * z < area_min).any():
+            return True
+
+    return False
+
+
+def has_loose_verts(geo: MeshGeometry) -> bool:
+    used = np.zeros(len(geo.co), dtype=bool)
+    used[geo.edges.ravel()] = True
+    return not used.all()
+
+
+def has_loose_edges(geo: MeshGeometry) -> bool:
+    used = np.zeros(len(geo.edges), dtype=bool)
+    used[geo.corner_edges] = True
+    return not used.all()
+
+
+def has_doubles(geo: MeshGeometry) -> bool:
+    """Vertices sorted along skewed axis, coincident ones are within merge distance along it,
+    neighbours are compared at growing offset until none of them are that close"""
+    if len(geo.co) < 2:
+        return False
+
+    proj = geo.co @ _DOUBLES_AXIS
+    order = np.argsort(proj)
+    proj = proj[order]
+    co = geo.co[order].astype(np.float64)
+
+    for offset in range(1, len(co)):
+        (near,) = np.nonzero(proj[offset:] - proj[:-offset] < MERGE_DISTANCE)
+        if not len(near):
+            return False
+
+        d = co[near + offset] - co[near]
+        if (d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1] + d[:, 2] * d[:, 2] < MERGE_DISTANCE * MERGE_DISTANCE).any():
+            return True
+
+    return False
+
+
+def has_non_manifold(geo: MeshGeometry) -> bool:
+    """Edges used by more than two faces"""
+    if not len(geo.corner_edges):
+        return False
+    return int(np.bincount(geo.corner_edges, minlength=len(geo.edges)).max()) > 2
+
+
+# Instrumentation
+# ----------------------------
+
+
+class Counter:
+    """Calls, detections and time, reused counts data check results
+    taken from another user of the same datablock instead of a call"""
+
+    __slots__ = "count", "hits", "total", "max", "reused"
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def add(self, duration: float, hit: bool = False) -> None:
+        self.count += 1
+        self.hits += hit
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def reset(self) -> None:
+        self.count = 0
+        self.hits = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.reused = 0
+
+    def as_dict(self) -> dict[str, int | float]:
+        return {"count": self.count, "hits": self.hits, "total": self.total, "max": self.max, "reused": self.reused}
+
+
+class Stats:
+    """Invocation count, detections and time per problem code and per scan pass,
+    time of resumable passes is accumulated with tick and recorded on close.
+    Counters are updated from object pass worker threads under the lock"""
+
+    __slots__ = "checks", "passes", "_open", "_lock"
+
+    def __init__(self) -> None:
+        self.checks: dict[int, Counter] = {}
+        self.passes: dict[str, Counter] = {}
+        self._open: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, duration: float) -> None:
+        with self._lock:
+            if (counter := self.passes.get(name)) is None:
+                counter = self.passes[name] = Counter()
+            counter.add(duration)
+
+    def tick(self, name: str, duration: float) -> None:
+        self._open[name] = self._open.get(name, 0.0) + duration
+
+    def close(self, name: str) -> None:
+        self.add(name, self._open.pop(name, 0.0))
+
+    def cancel(self) -> None:
+        """Drop time of unfinished passes"""
+        self._open.clear()
+
+    def _counter(self, code: int) -> Counter:
+        with self._lock:
+            if (counter := self.checks.get(code)) is None:
+                counter = self.checks[code] = Counter()
+            return counter
+
+    def reuse(self, code: int) -> None:
+        counter = self._counter(code)
+        with self._lock:
+            counter.reused += 1
+
+    def wrap(self, code: int, check: Callable[[Any], bool]) -> Callable[[Any], bool]:
+        counter = self._counter(code)
+        lock = self._lock
+
+        clock = time.perf_counter
+
+        def timed(value: Any) -> bool:
+            start = clock()
+            result = check(value)
+            duration = clock() - start
+            with lock:
+                counter.add(duration, bool(result))
+            return result
+
+        return timed
+
+    def clear(self) -> None:
+        # Reset in place, counters are referenced by compiled checks
+        with self._lock:
+            for counter in (*self.checks.values(), *self.passes.values()):
+                counter.reset()
+            self._open.clear()
+
+    def as_dict(self) -> dict[str, dict[str, dict[str, int | float]]]:
+        with self._lock:
+            return {
+                "checks": {str(code): x.as_dict() for code, x in sorted(self.checks.items())},
+                "passes": {name: x.as_dict() for name, x in self.passes.items()},
+            }
+
+
+# Registry
+# ----------------------------
+
+
+# Check scope, object and data checks are cached per object
+SCOPE_OBJECT = 0
+SCOPE_DATA = 1
+SCOPE_RELATION = 2
+
+
+class _CheckInfo(NamedTuple):
+    code: int
+    types: frozenset[str] | None
+    scope: int
+    cost: int
+    guard: str | None
+    stop: bool
+
+
+_registry: dict[str, _CheckInfo] = {}
+
+# Compiled check: code, bound check, takes object data, bound guard, stop on detection
+Compiled = tuple[int, Callable[[Any], bool], bool, Callable[[ObjectRecord], bool] | None, bool]
+
+
+def _register(
+    code: int,
+    types: set[str] | None = None,
+    scope: int = SCOPE_OBJECT,
+    cost: int = 1,
+    guard: str | None = None,
+    stop: bool = False,
+) -> Callable:
+    """Register check applicable to given object types (any if None),
+    checks run in order of relative cost, stop skips remaining checks on detection"""
+
+    def decorator(func: Callable) -> Callable:
+        name = func.__func__.__name__ if isinstance(func, staticmethod) else func.__name__
+        _registry[name] = _CheckInfo(code, frozenset(types) if types else None, scope, cost, guard, stop)
+        return func
+
+    return decorator
+
+
+class Detect:
+    """Per object state is set by the caller before running object checks:
+    uid and is_scaled of the current object, deformers and cyclic of the whole scene.
+
+    Data checks are evaluated once per datablock for the lifetime of the instance,
+    which must not outlive the data records it was run on"""
+
+    __slots__ = (
+        "disabled",
+        "stats",
+        "uid",
+        "is_scaled",
+        "deformers",
+        "cyclic",
+        "_disabled_mask",
+        "_tables",
+        "_geometry",
+        "_shared",
+    )
+    disabled: frozenset[int]
+    stats: Stats | None
+    uid: int
+    is_scaled: bool
+    deformers: dict[int, int] | set[int]
+    cyclic: set[int]
+    _disabled_mask: int
+    _tables: dict[tuple[str, int], tuple[tuple[Compiled, ...], tuple[Compiled, ...]]]
+    _geometry: tuple[tuple[int, Callable[[MeshRecord], bool]], ...] | None
+    _shared: dict[tuple[int, int], bool]
+
+    def __init__(self, disabled: Iterable[int] = (), stats: Stats | None = None) -> None:
+        self.disabled = frozenset(disabled)
+        self.stats = stats
+        self.deformers = set()
+        self.cyclic = set()
+        self._tables = {}
+        self._geometry = None
+        self._shared = {}
+        self._disabled_mask = problemlib.to_mask(self.disabled)
+
+    def table(
+        self,
+        type: str,
+        ignored: int = 0,
+    ) -> tuple[tuple[Compiled, ...], tuple[Compiled, ...]]:
+        """Return cacheable and relation checks for object type and mask of ignored problems"""
+        key = type, ignored
+
+        if (table := self._tables.get(key)) is None:
+            excluded = self._disabled_mask | ignored
+            cacheable = []
+            relations = []
+
+            for name, info in sorted(_registry.items(), key=lambda x: x[1].cost):
+                if problemlib.bits[info.code] & excluded or (info.types is not None and type not in info.types):
+                    continue
+
+                func = getattr(self, name)
+                if self.stats is not None:
+                    func = self.stats.wrap(info.code, func)
+
+                check = (
+                    info.code,
+                    func,
+                    info.scope is SCOPE_DATA,
+                    getattr(self, info.guard) if info.guard else None,
+                    info.stop,
+                )
+
+                if info.scope is SCOPE_RELATION:
+                    relations.append(check)
+                else:
+                    cacheable.append(check)
+
+            table = self._tables[key] = tuple(cacheable), tuple(relations)
+
+        return table
+
+    def run(self, checks: tuple[Compiled, ...], value: Any) -> set[int]:
+        found = set()
+
+        for code, check, is_data, guard, stop in checks:
+            if guard is not None and not guard(value):
+                continue
+
+            if not is_data:
+                result = check(value)
+            elif value.data is not None:
+                result = self._run_shared(code, check, value.data)
+            else:
+                continue
+
+            if result:
+                found.add(code)
+                if stop:
+                    break
+
+        return found
+
+    def analyze(self, data: Any) -> bool:
+        """Memoize enabled geometry checks of mesh record and release its arrays, return False
+        if arrays were already released and results of some enabled checks are missing"""
+        if (geo := getattr(data, "geometry", None)) is None:
+            return True
+
+        if self._geometry is None:
+            geometry = []
+            for name, info in _registry.items():
+                if info.code in GEOMETRY_CHECKS and info.code not in self.disabled:
+                    func = getattr(self, name)
+                    if self.stats is not None:
+                        func = self.stats.wrap(info.code, func)
+                    geometry.append((info.code, func))
+            self._geometry = tuple(geometry)
+
+        for code, check in self._geometry:
+            if code not in geo.memo:
+                if geo.is_released:
+                    return False
+                check(data)
+
+        geo.release()
+        return True
+
+    def fork(self) -> "Detect":
+        """Instance for another thread, data check results are shared with this instance"""
+        Check = Detect(self.disabled, self.stats)
+        Check._shared = self._shared
+        return Check
+
+    def _run_shared(self, code: int, check: Callable[[Any], bool], data: Any) -> bool:
+        key = data.uid, code
+
+        if (result := self._shared.get(key)) is None:
+            result = self._shared[key] = bool(check(data))
+        elif self.stats is not None:
+            self.stats.reuse(code)
+
+        return result
+
+    def inspect(self, snapshot: Snapshot) -> tuple[set[int], dict[int, frozenset[int]]]:
+        """Run all checks, return problems found in collections and per object"""
+        coll_found = set()
+        found = {}
+
+        checks, _ = self.table("COLLECTION")
+        if checks:
+            for coll in snapshot.collections:
+                coll_found |= self.run(checks, coll)
+
+        obs = snapshot.objects
+        graph = {}
+        deformers = set()
+
+        for ob in obs:
+            deformers |= ob.curves
+            for kind, deps in enumerate(ob.deps):
+                if deps:
+                    graph[ob.uid << 1 | kind] = deps
+
+        self.deformers = deformers
+        self.cyclic = find_cycles(graph)
+        mask = scaled_mask(np.array([ob.scale for ob in obs], dtype=np.float32).reshape(-1, 3))
+
+        for ob, scaled in zip(obs, mask.tolist()):
+            cacheable, relations = self.table(ob.type, ob.ignored)
+            self.uid = ob.uid
+            self.is_scaled = scaled
+
+            if problems := self.run(cacheable, ob) | self.run(relations, ob):
+                found[ob.uid] = frozenset(problems)
+
+        return coll_found, found
+
+    # Guards
+    # ----------------------------
+
+    def _is_deformer(self, ob: ObjectRecord) -> bool:
+        return self.uid in self.deformers
+
+    # Checks
+    # ----------------------------
+
+    @_register(problemlib.ID_OB_SCALE, {"MESH", "CURVE", "FONT"})
+    def _101(self, ob: ObjectRecord) -> bool:
+        if not self.is_scaled:
+            return False
+        if ob.type == "MESH":
+            return not ob.gem
+        return ob.data.bevel or (ob.modifiers and _is_mod_solidify(ob.modifiers))
+
+    @_register(problemlib.ID_OB_EMPTY, {"MESH", "CURVE"}, cost=0, stop=True)
+    @staticmethod
+    def _102(ob: ObjectRecord) -> bool:
+        methods = {
+            "CURVE": lambda ob: not ob.data.splines,
+            "MESH": lambda ob: not ob.data.vertices,
+        }
+
+        if (is_empty := methods.get(ob.type)) and is_empty(ob):
+            if ob.modifiers:
+                for mod in ob.modifiers:
+                    if (
+                        mod.type == "NODES" or
+                        (mod.type == "BOOLEAN" and mod.operation == "UNION" and mod.object)
+                    ):
+                        return False
+            return True
+
+        return False
+
+    @_register(problemlib.ID_MOD_ORDER, {"MESH"}, cost=2)
+    @staticmethod
+    def _201(ob: ObjectRecord) -> bool:
+        trigger = False
+        trigger_mods = {"CURVE", "LATTICE", "SHRINKWRAP", "SIMPLE_DEFORM", "BOOLEAN", "NODES"}
+
+        for mod in ob.modifiers:
+            if mod.type in trigger_mods:
+                if mod.type == "NODES":
+                    if mod.booltron:
+                        trigger = True
+                else:
+                    trigger = True
+            elif mod.type == "SUBSURF" and trigger:
+                return True
+
+        return False
+
+    @_register(problemlib.ID_CYCLIC_DEP, scope=SCOPE_RELATION)
+    def _202(self, ob: ObjectRecord) -> bool:
+        return self.uid in self.cyclic
+
+    @_register(problemlib.ID_CURVE_RADIUS, {"CURVE", "FONT"}, scope=SCOPE_DATA, cost=3, guard="_is_deformer")
+    @staticmethod
+    def _301(curve: CurveRecord) -> bool:
+        if curve.use_radius and curve.splines:
+            return bool((curve.radius != 1.0).any())
+
+        return False
+
+    @_register(problemlib.ID_CURVE_ORDER, {"CURVE", "FONT"}, scope=SCOPE_DATA, cost=2)
+    @staticmethod
+    def _302(curve: CurveRecord) -> bool:
+        for spline in curve.splines:
+            if spline.points and spline.order_u < 4:
+                return True
+
+        return False
+
+    @_register(problemlib.ID_CURVE_RESOLUTION, {"CURVE", "FONT"}, scope=SCOPE_DATA, guard="_is_deformer")
+    @staticmethod
+    def _303(curve: CurveRecord) -> bool:
+        return bool(curve.splines) and curve.splines[0].type != "POLY" and curve.resolution_u < 64
+
+    @_register(problemlib.ID_MESH_LOOSE_VERTS, {"MESH"}, scope=SCOPE_DATA, cost=4)
+    @staticmethod
+    @_memoized(problemlib.ID_MESH_LOOSE_VERTS)
+    def _305(geo: MeshGeometry) -> bool:
+        return has_loose_verts(geo)
+
+    @_register(problemlib.ID_MESH_LOOSE_EDGES, {"MESH"}, scope=SCOPE_DATA, cost=4)
+    @staticmethod
+    @_memoized(problemlib.ID_MESH_LOOSE_EDGES)
+    def _306(geo: MeshGeometry) -> bool:
+        return has_loose_edges(geo)
+
+    @_register(problemlib.ID_MESH_NON_MANIFOLD, {"MESH"}, scope=SCOPE_DATA, cost=5)
+    @staticmethod
+    @_memoized(problemlib.ID_MESH_NON_MANIFOLD)
+    def _308(geo: MeshGeometry) -> bool:
+        return has_non_manifold(geo)
+
+    @_register(problemlib.ID_MESH_ZERO_AREA, {"MESH"}, scope=SCOPE_DATA, cost=6)
+    @staticmethod
+    @_memoized(problemlib.ID_MESH_ZERO_AREA)
+    def _304(geo: MeshGeometry) -> bool:
+        return has_zero_area(geo)
+
+    @_register(problemlib.ID_MESH_DOUBLES, {"MESH"}, scope=SCOPE_DATA, cost=7)
+    @staticmethod
+    @_memoized(problemlib.ID_MESH_DOUBLES)
+    def _307(geo: MeshGeometry) -> bool:
+        return has_doubles(geo)
+
+    @_register(problemlib.ID_COLLECTION_NAME, {"COLLECTION"})
+    @staticmethod
+    def _401(coll: CollectionRecord) -> bool:
+        return coll.name.startswith("Collection")
+
+
+# Codes of checks depending on other objects, their results are not cached
+RELATION_CHECKS = frozenset(x.code for x in _registry.values() if x.scope is SCOPE_RELATION)
@@ -0,0 +1,241 @@
+# SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Usage: blender -c sidekick lint [-j JOBS] [-o OUTPUT] [--all-scenes] PATH [PATH ...]
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import bpy
+
+from . import var
+
+
+_CMD = "sidekick"
+_MARKER = "\x1esidekick:"
+
+
+def execute(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog=f"blender -c {_CMD}")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    lint = sub.add_parser("lint", help="Inspect .blend files and stream results as NDJSON")
+    lint.add_argument("paths", nargs="+", help="Files, directories or glob patterns")
+    lint.add_argument("-j", "--jobs", type=int, default=0, help="Number of worker processes, CPU count by default")
+    lint.add_argument("-o", "--output", type=Path, help="Write results to file instead of stdout")
+    lint.add_argument("--all-scenes", action="store_true", help="Inspect every scene and view layer")
+
+    worker = sub.add_parser("worker", help="Internal, scan files read from stdin")
+    worker.add_argument("--all-scenes", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        return _worker(args.all_scenes)
+
+    return _lint(args)
+
+
+# Dispatcher
+# ---------------------------
+
+
+def _collect(paths: list[str]) -> Iterator[Path]:
+    import glob
+
+    seen = set()
+
+    for pattern in paths:
+        path = Path(pattern)
+
+        if path.is_dir():
+            found = sorted(path.rglob("*.blend"))
+        elif path.is_file():
+            found = [path]
+        else:
+            found = sorted(Path(x) for x in glob.glob(pattern, recursive=True) if x.endswith(".blend"))
+
+        for x in found:
+            x = x.resolve()
+            if x not in seen:
+                seen.add(x)
+                yield x
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, round(pct / 100 * (len(values) - 1)))]
+
+
+def _lint(args: argparse.Namespace) -> int:
+    import os
+    import queue
+    import subprocess
+    import threading
+
+    files = list(_collect(args.paths))
+    if not files:
+        print("No .blend files found", file=sys.stderr)
+        return 1
+
+    jobs = min(args.jobs or os.cpu_count() or 1, len(files))
+    tasks = queue.SimpleQueue()
+    for path in files:
+        tasks.put(path)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    lock = threading.Lock()
+    scan_times = []
+    failed = 0
+    flagged = 0
+
+    cmd = [bpy.app.binary_path, "--background", "--command", _CMD, "worker"]
+    if args.all_scenes:
+        cmd.append("--all-scenes")
+
+    def close(proc: subprocess.Popen) -> None:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        proc.wait()
+
+    def request(proc: subprocess.Popen, path: Path) -> str | None:
+        """Return result line, None if worker terminated"""
+        try:
+            proc.stdin.write(f"{path}\n")
+            proc.stdin.flush()
+        except BrokenPipeError:
+            return None
+
+        for line in proc.stdout:
+            if line.startswith(_MARKER):
+                return line[len(_MARKER):]
+
+        return None
+
+    def run() -> None:
+        nonlocal failed, flagged
+
+        proc = None
+
+        try:
+            while True:
+                try:
+                    path = tasks.get_nowait()
+                except queue.Empty:
+                    break
+
+                # Worker is restarted after it terminates, damaged files can crash it
+                if proc is not None and proc.poll() is not None:
+                    close(proc)
+                    proc = None
+
+                if proc is None:
+                    proc = subprocess.Popen(
+                        cmd,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        text=True,
+                        encoding="utf-8",
+                    )
+
+                if (result := request(proc, path)) is None:
+                    result = json.dumps({"file": str(path), "error": "Worker terminated"}) + "\n"
+                    close(proc)
+                    proc = None
+
+                data = json.loads(result)
+
+                with lock:
+                    out.write(result)
+                    out.flush()
+                    if "error" in data:
+                        failed += 1
+                    else:
+                        scan_times.append(data["time"])
+                        if data["problems"]:
+                            flagged += 1
+        finally:
+            if proc is not None:
+                close(proc)
+
+    time_start = time.perf_counter()
+
+    threads = [threading.Thread(target=run) for _ in range(jobs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - time_start
+
+    if out is not sys.stdout:
+        out.close()
+
+    done = len(scan_times) + failed
+    print(
+        f"Files: {done} ({flagged} with problems, {failed} failed), workers: {jobs}\n"
+        f"Wall time: {elapsed:.2f} s, throughput: {done / elapsed:.2f} files/s\n"
+        f"Scan time per file: p50 {_percentile(scan_times, 50) * 1000:.1f} ms, "
+        f"p95 {_percentile(scan_times, 95) * 1000:.1f} ms",
+        file=sys.stderr,
+    )
+
+    return 1 if failed or flagged else 0
+
+
+# Worker
+# ---------------------------
+
+
+def _summary(report) -> dict:
+    return {
+        "errors": report.errors,
+        "warnings": report.warns,
+        "problems": [x.code for x in report.problems],
+        "ignored": [x.code for x in report.problems_ignored],
+        "objects": {name: sorted(codes) for name, codes in report.obs},
+    }
+
+
+def _scan(path: str, all_scenes: bool = False) -> dict:
+    try:
+        bpy.ops.wm.open_mainfile(filepath=path, load_ui=False)
+    except RuntimeError as e:
+        return {"file": path, "error": str(e)}
+
+    time_start = time.perf_counter()
+
+    if all_scenes:
+        groups = var.Report.get_file()
+        scan_time = time.perf_counter() - time_start
+        scenes = [{"scene": x.scene, "view_layer": x.view_layer, **_summary(x.summary)} for x in groups]
+
+        return {
+            "file": path,
+            "time": scan_time,
+            "problems": sorted({code for x in scenes for code in x["problems"]}),
+            "scenes": scenes,
+        }
+
+    var.Report.get()
+    scan_time = time.perf_counter() - time_start
+
+    return {"file": path, "time": scan_time, **_summary(var.Report)}
+
+
+def _worker(all_scenes: bool = False) -> int:
+    for line in sys.stdin:
+        if path := line.strip():
+            result = json.dumps(_scan(path, all_scenes))
+            sys.stdout.write(f"{_MARKER}{result}\n")
+            sys.stdout.flush()
+
+    return 0
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Findings are written one by one, the document is never built in memory as a whole
+
+import json
+from collections.abc import Iterable
+from functools import cache
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+from . import problemlib
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+URL = "https://github.com/mrachinskiy/sidekick"
+
+
+class Finding(NamedTuple):
+    code: int
+    ignored: bool
+    object: str | None = None
+    datablock: str | None = None
+    collection: str | None = None
+
+
+@cache
+def addon_version() -> str:
+    import tomllib
+
+    with open(Path(__file__).with_name("blender_manifest.toml"), "rb") as file:
+        return tomllib.load(file)["version"]
+
+
+def _severity(problem: problemlib.Problem) -> str:
+    return "error" if problem.type is problemlib.TYPE_ERROR else "warning"
+
+
+def _open(head: dict[str, Any]) -> str:
+    """Serialized object without closing brace, so more members can follow"""
+    return json.dumps(head, ensure_ascii=False)[:-1]
+
+
+def _write_array(file: IO[str], items: Iterable[Any]) -> int:
+    """Write JSON array item by item, return number of items"""
+    count = 0
+    file.write("[")
+
+    for item in items:
+        if count:
+            file.write(",")
+        file.write("\n")
+        file.write(json.dumps(item, ensure_ascii=False))
+        count += 1
+
+    file.write("\n]")
+    return count
+
+
+# JSON
+# ---------------------------
+
+
+def _json_item(finding: Finding) -> dict[str, Any]:
+    problem = problemlib.coll[finding.code]
+    return {
+        "code": finding.code,
+        "severity": _severity(problem),
+        "title": problem.title,
+        "object": finding.object,
+        "datablock": finding.datablock,
+        "collection": finding.collection,
+        "ignored": finding.ignored,
+    }
+
+
+def write_json(file: IO[str], findings: Iterable[Finding], info: dict[str, Any]) -> int:
+    """Write scan info followed by findings, return number of findings"""
+    file.write(_open(info))
+    file.write(', "findings": ')
+    count = _write_array(file, (_json_item(x) for x in findings))
+    file.write("}\n")
+    return count
+
+
+# SARIF
+# ---------------------------
+
+
+def _sarif_item(finding: Finding, rules: dict[int, int], uri: str | None) -> dict[str, Any]:
+    problem = problemlib.coll[finding.code]
+
+    if finding.object is not None:
+        logical = {"name": finding.object, "kind": "object"}
+    else:
+        logical = {"name": finding.collection, "kind": "collection"}
+
+    location = {"logicalLocations": [logical]}
+    if uri:
+        location["physicalLocation"] = {"artifactLocation": {"uri": uri}}
+
+    result = {
+        "ruleId": str(finding.code),
+        "ruleIndex": rules[finding.code],
+        "level": _severity(problem),
+        "message": {"text": problem.title},
+        "locations": [location],
+    }
+
+    if finding.datablock is not None:
+        result["properties"] = {"datablock": finding.datablock}
+    if finding.ignored:
+        result["suppressions"] = [{"kind": "inSource"}]
+
+    return result
+
+
+def write_sarif(file: IO[str], findings: Iterable[Finding], info: dict[str, Any]) -> int:
+    """Write SARIF log with a single run, scan info is stored in run properties"""
+    uri = info.get("uri")
+    rules = {}
+    descriptors = []
+
+    for i, problem in enumerate(problemlib.coll.values()):
+        rules[problem.code] = i
+        descriptors.append({
+            "id": str(problem.code),
+            "shortDescription": {"text": problem.title},
+            "fullDescription": {"text": problem.desc},
+            "defaultConfiguration": {"level": _severity(problem)},
+        })
+
+    run = {
+        "tool": {
+            "driver": {
+                "name": "Sidekick",
+                "version": info.get("version"),
+                "informationUri": URL,
+                "rules": descriptors,
+            },
+        },
+        "invocations": [{"executionSuccessful": True}],
+        "properties": info,
+    }
+    if uri:
+        run["artifacts"] = [{"location": {"uri": uri}}]
+
+    file.write(_open({"$schema": SARIF_SCHEMA, "version": SARIF_VERSION}))
+    file.write(', "runs": [')
+    file.write(_open(run))
+    file.write(', "results": ')
+    count = _write_array(file, (_sarif_item(x, rules, uri) for x in findings))
+    file.write("}]}\n")
+    return count
+
+
+WRITERS = {"JSON": write_json, "SARIF": write_sarif}
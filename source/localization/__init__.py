@@ -1,12 +1,31 @@
 # SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import pickle
-from collections.abc import Iterator
+# Each .po file is compiled into binary catalog next to it on first use,
+# catalog is rebuilt when source size and mtime differ and content hash does not match
+
+import hashlib
+import struct
 from pathlib import Path
 
+Catalog = dict[tuple[str, str], str]
+
+DIR = Path(__file__).parent
+SUFFIX = ".catalog"
+
+_MAGIC = b"SKTR"
+_VERSION = 1
+
+# Magic, format version, source mtime in ns, source size, source hash, number of entries
+_HEADER = struct.Struct("<4sIqq16sI")
+
+# Offset and length in string blob of context, message and translation
+_ENTRY = struct.Struct("<6I")
 
-def _po_parse(text: str) -> dict[tuple[str, str], str]:
+_loaded: dict[Path, Catalog] = {}
+
+
+def _po_parse(text: str) -> Catalog:
     import re
     concat_multiline = text.replace('"\n"', "")
     entries = re.findall(r'(?:msgctxt\s*"(.+)")?\s*msgid\s*"(.+)"\s*msgstr\s*"(.*)"', concat_multiline)
@@ -18,26 +37,110 @@ def _po_parse(text: str) -> dict[tuple[str, str], str]:
     }
 
 
-def _walk() -> Iterator[tuple[str, dict[tuple[str, str], str]]]:
-    for child in Path(__file__).parent.iterdir():
-        if child.is_file() and child.suffix == ".po":
-            with open(child, "r", encoding="utf-8") as file:
-                yield child.stem, _po_parse(file.read())
+def _hash(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+# Catalog
+# ---------------------------
+
+
+def build(po: Path) -> bytes:
+    source = po.read_bytes()
+    stat = po.stat()
+    catalog = _po_parse(source.decode("utf-8"))
+    blob = bytearray()
+    table = bytearray()
+
+    for (ctxt, key), msg in catalog.items():
+        entry = []
+        for text in (ctxt, key, msg):
+            data = text.encode("utf-8")
+            entry += len(blob), len(data)
+            blob += data
+        table += _ENTRY.pack(*entry)
+
+    header = _HEADER.pack(_MAGIC, _VERSION, stat.st_mtime_ns, stat.st_size, _hash(source), len(catalog))
+    return header + table + blob
+
+
+def read(data: bytes) -> Catalog:
+    count = _HEADER.unpack_from(data)[-1]
+    start = _HEADER.size + _ENTRY.size * count
+    blob = data[start:]
+    catalog = {}
+
+    for ctxt_ofs, ctxt_len, key_ofs, key_len, msg_ofs, msg_len in _ENTRY.iter_unpack(data[_HEADER.size:start]):
+        ctxt = blob[ctxt_ofs:ctxt_ofs + ctxt_len].decode("utf-8")
+        key = blob[key_ofs:key_ofs + key_len].decode("utf-8")
+        catalog[ctxt, key] = blob[msg_ofs:msg_ofs + msg_len].decode("utf-8")
+
+    return catalog
+
+
+def _validate(data: bytes, po: Path) -> bytes | None:
+    """Return catalog data if it matches source, header is refreshed
+    when source was touched without content change"""
+    try:
+        magic, version, mtime, size, digest, count = _HEADER.unpack_from(data)
+    except struct.error:
+        return None
+
+    if magic != _MAGIC or version != _VERSION:
+        return None
+
+    stat = po.stat()
+
+    if stat.st_mtime_ns == mtime and stat.st_size == size:
+        return data
+
+    if stat.st_size == size and _hash(po.read_bytes()) == digest:
+        return _HEADER.pack(magic, version, stat.st_mtime_ns, size, digest, count) + data[_HEADER.size:]
+
+    return None
+
+
+def _write(path: Path, data: bytes) -> None:
+    try:
+        path.write_bytes(data)
+    except OSError:
+        pass  # Read-only install, catalog is compiled again on next load
+
+
+# Loader
+# ---------------------------
+
+
+def locales(directory: Path = DIR) -> list[str]:
+    return sorted(child.stem for child in directory.glob("*.po"))
+
+
+def load(locale: str, directory: Path = DIR) -> Catalog | None:
+    """Return translations for locale, None if there is no catalog for it"""
+    po = directory / f"{locale}.po"
+
+    if (catalog := _loaded.get(po)) is not None:
+        return catalog
 
+    if not po.is_file():
+        return None
 
-def _init() -> dict[str, dict[tuple[str, str], str]]:
-    path = Path(__file__).parent / "__cache__.pickle"
+    path = po.with_suffix(SUFFIX)
 
-    if path.exists():
-        with open(path, "rb") as file:
-            return pickle.load(file)
+    try:
+        cached = path.read_bytes()
+    except OSError:
+        cached = b""
 
-    dictionary = {locale: trnsl for locale, trnsl in _walk()}
+    if (data := _validate(cached, po)) is None:
+        data = build(po)
 
-    with open(path, "wb") as file:
-        pickle.dump(dictionary, file, pickle.HIGHEST_PROTOCOL)
+    if data is not cached:
+        _write(path, data)
 
-    return dictionary
+    catalog = _loaded[po] = read(data)
+    return catalog
 
 
-DICTIONARY = _init()
+def clear() -> None:
+    _loaded.clear()
@@ -3,10 +3,11 @@
 
 import bpy
 from bpy.app.translations import pgettext_tip as _
-from bpy.props import BoolProperty, IntProperty
+from bpy.props import BoolProperty, EnumProperty, IntProperty, StringProperty
 from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
 
-from . import problemlib, var
+from . import problemlib, snapshot, var
 
 
 class OBJECT_OT_select(Operator):
@@ -19,16 +20,18 @@ class OBJECT_OT_select(Operator):
     use_ignored: BoolProperty(options={"SKIP_SAVE", "HIDDEN"})
 
     def execute(self, context):
-        ob_get = bpy.data.objects.get
-        report_obs = var.Report.obs_ignored if self.use_ignored else var.Report.obs
-        obs = set(ob_get(ob_name) for ob_name, problems in report_obs if self.code in problems)
         selection_failed = False
 
-        for ob in context.scene.objects:
-            is_problem = ob in obs
-            ob.select_set(is_problem)
+        for ob in context.selected_objects:
+            ob.select_set(False)
 
-            if is_problem and not (ob.visible_get() and ob.select_get()):
+        for ob in var.Report.objects(self.code, self.use_ignored):
+            try:
+                ob.select_set(True)
+            except ReferenceError:
+                continue  # Removed since last scan
+
+            if not (ob.visible_get() and ob.select_get()):
                 selection_failed = True
 
         if context.selected_objects and not context.view_layer.objects.active.select_get():
@@ -40,6 +43,74 @@ class OBJECT_OT_select(Operator):
         return {"FINISHED"}
 
 
+class WM_OT_scan_file(Operator):
+    bl_label = "Scan All Scenes"
+    bl_description = "Inspect every scene and view layer of the file"
+    bl_idname = "wm.sidekick_scan_file"
+    bl_options = {"INTERNAL"}
+
+    def execute(self, context):
+        groups = var.Report.get_file()
+        flagged = sum(1 for x in groups if x.summary.problems)
+        self.report({"INFO"}, _("Scanned {}, with problems {}").format(len(groups), flagged))
+
+        for area in context.screen.areas:
+            area.tag_redraw()
+
+        return {"FINISHED"}
+
+
+class WM_OT_stats_reset(Operator):
+    bl_label = "Reset"
+    bl_description = "Reset instrumentation counters"
+    bl_idname = "wm.sidekick_stats_reset"
+    bl_options = {"INTERNAL"}
+
+    def execute(self, context):
+        var.Report.stats.clear()
+        return {"FINISHED"}
+
+
+class WM_OT_stats_export(ExportHelper, Operator):
+    bl_label = "Export"
+    bl_description = "Save instrumentation counters to JSON file"
+    bl_idname = "wm.sidekick_stats_export"
+    bl_options = {"INTERNAL"}
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
+
+    def execute(self, context):
+        context.window_manager.sidekick.stats_dump(self.filepath)
+        return {"FINISHED"}
+
+
+class WM_OT_report_export(ExportHelper, Operator):
+    bl_label = "Export Report"
+    bl_description = "Save scan results to JSON or SARIF file"
+    bl_idname = "wm.sidekick_report_export"
+    bl_options = {"INTERNAL"}
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json;*.sarif", options={"HIDDEN"})
+    format: EnumProperty(
+        name="Format",
+        items=(
+            ("JSON", "JSON", ""),
+            ("SARIF", "SARIF", "Static Analysis Results Interchange Format"),
+        ),
+    )
+
+    def check(self, context):
+        self.filename_ext = ".sarif" if self.format == "SARIF" else ".json"
+        return super().check(context)
+
+    def execute(self, context):
+        count = context.window_manager.sidekick.report_dump(self.filepath, self.format)
+        self.report({"INFO"}, _("Exported {} findings").format(count))
+        return {"FINISHED"}
+
+
 class WM_OT_show_description(Operator):
     bl_label = "Show Description"
     bl_description = "Show problem description"
@@ -77,16 +148,16 @@ class WM_OT_show_description(Operator):
         return wm.invoke_popup(self, width=width)
 
 
-def _cls_Problems():
-    x = "class Problems:"
-    for code, problem in problemlib.coll.items():
-        if not problem.select:
-            continue
-        x += f'\n problem_{code}: BoolProperty(name="{problem.title}", description="{code}", options={{"SKIP_SAVE", "HIDDEN"}})'
-    return x
+def _cls_Problems() -> type:
+    props = {
+        f"problem_{code}": BoolProperty(name=problem.title, description=str(code), options={"SKIP_SAVE", "HIDDEN"})
+        for code, problem in problemlib.coll.items()
+        if problem.select
+    }
+    return type("Problems", (), {"__annotations__": props})
 
 
-exec(_cls_Problems())
+Problems = _cls_Problems()
 
 
 class OBJECT_OT_ignore(Problems, Operator):
@@ -95,20 +166,22 @@ class OBJECT_OT_ignore(Problems, Operator):
     bl_idname = "object.sidekick_ignore"
     bl_options = {"REGISTER", "UNDO", "INTERNAL"}
 
+    mode: EnumProperty(
+        name="Mode",
+        items=(
+            ("SET", "Replace", "Replace ignored problems of selected objects"),
+            ("ADD", "Add", "Add to ignored problems of selected objects"),
+            ("REMOVE", "Remove", "Remove from ignored problems of selected objects"),
+        ),
+        options={"SKIP_SAVE"},
+    )
+
     def execute(self, context):
         codes = [
             code for code, problem in problemlib.coll.items()
             if problem.select and getattr(self, f"problem_{code}")
         ]
-
-        if codes:
-            for ob in context.selected_objects:
-                ob["sidekick_ignore"] = codes
-        else:
-            for ob in context.selected_objects:
-                if "sidekick_ignore" in ob:
-                    del ob["sidekick_ignore"]
-
+        context.window_manager.sidekick.ignore(context.selected_objects, codes, self.mode)
         return {"FINISHED"}
 
     def draw(self, context):
@@ -116,6 +189,8 @@ class OBJECT_OT_ignore(Problems, Operator):
         layout.use_property_split = True
         layout.use_property_decorate = False
 
+        layout.row().prop(self, "mode", expand=True)
+
         for code, problem in problemlib.coll.items():
             if not problem.select:
                 continue
@@ -135,8 +210,8 @@ class OBJECT_OT_ignore(Problems, Operator):
         if not context.selected_objects:
             return {"CANCELLED"}
 
-        if context.object is not None and (codes := context.object.get("sidekick_ignore")):
-            for code in codes:
+        if context.object is not None and (mask := snapshot.read_ignored(context.object)):
+            for code in problemlib.from_mask(mask):
                 if hasattr(self, f"problem_{code}"):
                     setattr(self, f"problem_{code}", True)
 
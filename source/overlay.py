@@ -0,0 +1,270 @@
+# SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Loaded on first draw, keeps GPU and font modules out of add-on startup
+
+import itertools
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from math import cos, sin, tau
+
+import blf
+import bpy
+import gpu
+from bpy.app.translations import pgettext_iface as _t
+from gpu.types import GPUShader
+from gpu_extras.batch import batch_for_shader
+
+from . import problemlib, var
+
+
+# Overlay
+# -------------------------------------
+
+
+_COLORS = {
+    problemlib.TYPE_ERROR: (1.0, 0.25, 0.25, 1.0),
+    problemlib.TYPE_WARN: (1.0, 0.8, 0.2, 1.0),
+}
+
+_shader: GPUShader | None = None
+_layouts: dict[tuple, "_Layout"] = {}
+
+
+class _Layout:
+    """Prebuilt icon batches merged per color and positioned strings,
+    offsets are relative to the overlay origin"""
+
+    __slots__ = "fontsize", "font_h", "batches", "texts", "progress_y"
+
+    def __init__(self, shader: GPUShader, fontid: int, fontsize: int, style_detailed: bool) -> None:
+        blf.size(fontid, fontsize)
+        _, font_h = blf.dimensions(fontid, "Font Height")
+        row_height = round(font_h * 1.7)
+        icon_size = round(font_h / 2)
+
+        report = var.Report
+        icons = {problemlib.TYPE_ERROR: [], problemlib.TYPE_WARN: []}
+        texts = []
+
+        if style_detailed:
+            y = 0.0
+
+            for problem in report.problems:
+                y -= row_height
+                icons[problem.type] += _offset(_ICONS[problem.type](icon_size), 0.0, y)
+                texts.append((font_h, y, _t(problem.title)))
+
+            rows = len(report.problems)
+
+        else:
+            x = 0.0
+            y = -row_height
+
+            for num, problem_type in ((report.errors, problemlib.TYPE_ERROR), (report.warns, problemlib.TYPE_WARN)):
+                if not num:
+                    continue
+
+                text = str(num)
+                icons[problem_type] += _offset(_ICONS[problem_type](icon_size), x, y)
+                texts.append((x + font_h, y, text))
+
+                font_w, _ = blf.dimensions(fontid, text)
+                x += font_h * 2 + font_w
+
+            rows = bool(report.problems)
+
+        self.fontsize = fontsize
+        self.font_h = font_h
+        self.batches = tuple(
+            (_COLORS[problem_type], batch_for_shader(shader, "LINES", {"pos": co}))
+            for problem_type, co in icons.items()
+            if co
+        )
+        self.texts = tuple(texts)
+        self.progress_y = -row_height * (rows + 1)
+
+
+def _get_layout(shader: GPUShader, fontid: int, fontsize: int, ui_scale: float, style_detailed: bool) -> _Layout:
+    key = var.Report.generation, fontsize, ui_scale, bpy.app.translations.locale, style_detailed
+
+    if (layout := _layouts.get(key)) is None:
+        if len(_layouts) > 7:
+            _layouts.clear()
+        layout = _layouts[key] = _Layout(shader, fontid, fontsize, style_detailed)
+
+    return layout
+
+
+def _get_font_scale(prefs: bpy.types.Preferences) -> float:
+    if bpy.app.version < (4, 3, 0):
+        font_size = prefs.ui_styles[0].widget_label.points
+    else:
+        font_size = prefs.ui_styles[0].widget.points
+
+    return font_size * prefs.view.ui_scale / 11  # 11 is the default font size
+
+
+def draw():
+    global _shader
+
+    context = bpy.context
+    overlay = context.space_data.overlay
+
+    if not (context.window_manager.sidekick.show_problems and overlay.show_overlays):
+        return
+
+    prefs = context.preferences
+    ui_scale = prefs.view.ui_scale
+    style_detailed = prefs.addons[__package__].preferences.overlay_style == "DETAILED"
+    fontscale = _get_font_scale(prefs)
+
+    fontid = 0
+    fontsize = round(fontscale * 17)
+
+    if _shader is None:
+        _shader = gpu.shader.from_builtin("POLYLINE_UNIFORM_COLOR")
+    shader = _shader
+    shader.uniform_float("viewportSize", (context.area.width, context.area.height))
+    shader.uniform_float("lineWidth", 1.8)
+
+    layout = _get_layout(shader, fontid, fontsize, ui_scale, style_detailed)
+    font_h = layout.font_h
+    icon_size = round(font_h / 2)
+
+    # Starting position
+
+    x = round(12 * ui_scale) + icon_size
+    y = round(5 * ui_scale)
+
+    for region in context.area.regions:
+        if region.type in {"HEADER", "TOOL_HEADER"}:
+            y += region.height
+        elif region.type == "TOOLS":
+            x += region.width
+
+    # Viewport text offset
+    # -------------------------------------
+
+    _y = 0
+
+    if overlay.show_text:
+        view = prefs.view
+        if view.show_object_info:
+            _y += 25
+        if view.show_view_name or (view.show_playback_fps and context.screen.is_animation_playing):
+            _y += 25
+
+    if overlay.show_stats:
+        _y += 130
+
+    y += round(_y * fontscale)
+
+    # -------------------------------------
+
+    y = context.region.height - y
+    gpu.matrix.translate((x, y))
+    gpu.state.blend_set("ALPHA")
+
+    for color, batch in layout.batches:
+        shader.uniform_float("color", color)
+        batch.draw(shader)
+
+    blf.size(fontid, layout.fontsize)
+    blf.color(fontid, *prefs.themes[0].view_3d.space.text_hi, 1.0)
+
+    for text_x, text_y, text in layout.texts:
+        blf.position(fontid, text_x, text_y, 0.0)
+        blf.draw(fontid, text)
+
+    if var.Report.progress is not None:
+        blf.position(fontid, font_h, layout.progress_y, 0.0)
+        blf.draw(fontid, f"{_t('Scanning')} {var.Report.progress:.0%}")
+
+    gpu.state.blend_set("NONE")
+    gpu.matrix.load_identity()
+
+
+# Icons
+# -------------------------------------
+
+
+@lru_cache(maxsize=8)
+def _icon_error(radius: float) -> tuple[tuple[float, float], ...]:
+    radius *= 1.15
+    y = radius / 1.3
+    angle = tau / 12
+
+    circle = [
+        (
+            sin(i * angle) * radius,
+            cos(i * angle) * radius + y,
+        )
+        for i in range(12)
+    ]
+
+    radius *= 0.4
+
+    x_sign = (
+        ( radius, y + radius),
+        (-radius, y - radius),
+        (-radius, y + radius),
+        ( radius, y - radius),
+    )
+
+    return (*_co_pairs_cyclic(circle), *x_sign)
+
+
+@lru_cache(maxsize=8)
+def _icon_warning(radius: float) -> tuple[tuple[float, float], ...]:
+    radius *= 1.1
+    y = -radius / 4
+
+    tri = (
+        (0.0, y + radius * 2),
+        (0.0 - radius, y),
+        (0.0 + radius, y),
+    )
+
+    y = -y
+
+    exclamation = (
+        (0.0, y + radius * 0.9),
+        (0.0, y + radius * 0.2),
+        (0.0, y),
+        (0.0, y - radius * 0.2),
+    )
+
+    return (*_co_pairs_cyclic(tri), *exclamation)
+
+
+_ICONS = {
+    problemlib.TYPE_ERROR: _icon_error,
+    problemlib.TYPE_WARN: _icon_warning,
+}
+
+
+# Utils
+# -------------------------------------
+
+
+def _co_pairs_cyclic(a: Iterable) -> Iterator[tuple[float, float]]:
+    b = itertools.cycle(a)
+    next(b)
+
+    for co1, co2 in zip(a, b):
+        yield co1
+        yield co2
+
+
+def _co_pairs(x: Iterable) -> Iterator[tuple[float, float]]:
+    a, b = itertools.tee(x)
+    next(b, None)
+
+    for co1, co2 in zip(a, b):
+        yield co1
+        yield co2
+
+
+def _offset(co: Iterable[tuple[float, float]], x: float, y: float) -> list[tuple[float, float]]:
+    return [(co_x + x, co_y + y) for co_x, co_y in co]
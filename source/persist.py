@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Scan results stored in the .blend file, objects are keyed by name since session UIDs
+# differ between sessions. Payload is ignored when add-on version, problem set
+# or disabled problems differ from the ones it was written with
+
+import hashlib
+import struct
+import zlib
+from collections.abc import Hashable, Iterable
+from typing import NamedTuple
+
+from . import problemlib
+
+
+# Scene custom property, leading underscore hides it from the interface
+PROP = "_sidekick_results"
+
+# Uncompressed size limit, objects past it are not stored and get scanned on load
+MAX_SIZE = 8 << 20
+
+_MAGIC = b"SKRS"
+_VERSION = 1
+
+# Magic, format version, compatibility tag, number of objects, number of collection problems
+_HEADER = struct.Struct("<4sH8sII")
+
+# Fingerprint, found and ignored problem bits, name length
+_ENTRY = struct.Struct("<8sIIH")
+
+# Problem code, number of collections
+_COLL = struct.Struct("<HI")
+
+_LEN = struct.Struct("<H")
+
+
+class Entry(NamedTuple):
+    fingerprint: bytes
+    found: int  # Problem masks
+    ignored: int
+
+
+class Payload(NamedTuple):
+    view_layer: str
+    objects: dict[str, Entry]
+    coll_found: dict[int, int]
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def tag(version: str, disabled: Iterable[int]) -> bytes:
+    """Compatibility tag of add-on version, problem set and disabled problems"""
+    codes = ",".join(str(x) for x in problemlib.coll)
+    off = ",".join(str(x) for x in sorted(disabled))
+    return _digest(f"{version};{codes};{off}".encode())
+
+
+def fingerprint(key: Hashable) -> bytes:
+    """Digest of fingerprint made of values kept between sessions"""
+    return _digest(repr(key).encode())
+
+
+def encode(
+    tag: bytes,
+    view_layer: str,
+    objects: Iterable[tuple[str, Entry]],
+    coll_found: dict[int, int],
+) -> bytes:
+    table = bytearray()
+    blob = bytearray()
+    count = 0
+
+    for name, entry in objects:
+        data = name.encode("utf-8")
+
+        if len(table) + len(blob) + _ENTRY.size + len(data) > MAX_SIZE:
+            break
+
+        table += _ENTRY.pack(entry.fingerprint, entry.found, entry.ignored, len(data))
+        blob += data
+        count += 1
+
+    vl = view_layer.encode("utf-8")
+    body = b"".join((
+        _LEN.pack(len(vl)),
+        vl,
+        *(_COLL.pack(code, num) for code, num in coll_found.items()),
+        table,
+        blob,
+    ))
+
+    return _HEADER.pack(_MAGIC, _VERSION, tag, count, len(coll_found)) + zlib.compress(body)
+
+
+def decode(data: bytes, tag: bytes) -> Payload | None:
+    """Return stored results, None if payload is damaged or was written with different tag"""
+    try:
+        magic, version, payload_tag, count, coll_count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION or payload_tag != tag:
+            return None
+
+        body = zlib.decompress(data[_HEADER.size:])
+        (vl_len,) = _LEN.unpack_from(body)
+        ofs = _LEN.size + vl_len
+        view_layer = body[_LEN.size:ofs].decode("utf-8")
+
+        coll_found = {}
+        for _ in range(coll_count):
+            code, num = _COLL.unpack_from(body, ofs)
+            coll_found[code] = num
+            ofs += _COLL.size
+
+        start = ofs + _ENTRY.size * count
+        objects = {}
+
+        for digest, found, ignored, name_len in _ENTRY.iter_unpack(body[ofs:start]):
+            name = body[start:start + name_len].decode("utf-8")
+            objects[name] = Entry(digest, found, ignored)
+            start += name_len
+    except (struct.error, zlib.error, UnicodeDecodeError):
+        return None
+
+    return Payload(view_layer, objects, coll_found)
@@ -1,10 +1,12 @@
 # SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from bpy.props import BoolProperty, EnumProperty, PointerProperty
-from bpy.types import AddonPreferences, Collection, PropertyGroup
+from collections.abc import Iterable
 
-from . import problemlib, ui, var
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, PointerProperty
+from bpy.types import AddonPreferences, Collection, Object, PropertyGroup
+
+from . import onscreen, problemlib, ui, var
 
 
 def upd_report(self, context):
@@ -14,18 +16,23 @@ def upd_report(self, context):
         var.Report.get()
 
 
+def upd_cache_size(self, context):
+    var.Report.cache.resize(self.cache_size)
+
+
 # Add-on preferences
 # -----------------------------------
 
 
-def _cls_Problems():
-    x = "class Problems:"
-    for code, problem in problemlib.coll.items():
-        x += f'\n problem_{code}: BoolProperty(name="{problem.title}", description="{code}", default=True)'
-    return x
+def _cls_Problems() -> type:
+    props = {
+        f"problem_{code}": BoolProperty(name=problem.title, description=str(code), default=True)
+        for code, problem in problemlib.coll.items()
+    }
+    return type("Problems", (), {"__annotations__": props})
 
 
-exec(_cls_Problems())
+Problems = _cls_Problems()
 
 
 class Preferences(Problems, AddonPreferences):
@@ -38,6 +45,43 @@ class Preferences(Problems, AddonPreferences):
             ("COMPACT", "Compact", "Show only number of problems"),
         ),
     )
+    scan_budget: IntProperty(
+        name="Time Slice",
+        description="Maximum time in milliseconds spent on scene inspection per refresh, larger scenes are inspected over several refreshes",
+        default=4,
+        min=1,
+    )
+    scan_threads: IntProperty(
+        name="Background Threads",
+        description="Number of threads analysing extracted scene data while the interface keeps responding, 0 to analyse on the main thread",
+        default=1,
+        min=0,
+        soft_max=16,
+    )
+    cache_size: IntProperty(
+        name="Cache Size",
+        description="Maximum number of objects with cached scan results, 0 to disable",
+        default=200_000,
+        min=0,
+        update=upd_cache_size,
+    )
+    scan_duty: FloatProperty(
+        name="Scan Time Limit",
+        description="Maximum share of time spent on scene inspection, refresh interval grows to stay within the limit",
+        default=0.2,
+        min=0.01,
+        max=1.0,
+        subtype="FACTOR",
+    )
+    use_persist: BoolProperty(
+        name="Store Results in File",
+        description="Save last scan results in the .blend file to show them right away when the file is opened",
+        default=True,
+    )
+    use_stats: BoolProperty(
+        name="Instrumentation",
+        description="Record number of calls, detections and time per check and scan pass",
+    )
 
     def draw(self, context):
         ui.prefs_ui(self, context)
@@ -50,6 +94,8 @@ class Preferences(Problems, AddonPreferences):
 class WmProperties(PropertyGroup):
     prefs_show_interface: BoolProperty(name="Interface")
     prefs_show_problems: BoolProperty(name="Problems")
+    prefs_show_performance: BoolProperty(name="Performance")
+    prefs_show_stats: BoolProperty(name="Instrumentation")
     show_problems: BoolProperty(
         name="Problems",
         description="Show scene problems",
@@ -59,9 +105,58 @@ class WmProperties(PropertyGroup):
 
     def problems(self, rescan=False) -> list[problemlib.Problem]:
         if rescan:
+            var.Report.cache.clear()
             var.Report.get()
         return var.Report.problems
 
+    def problems_file(self) -> dict[tuple[str, str], list[problemlib.Problem]]:
+        """Scan every scene and view layer of the file, return problems per scene and view layer name"""
+        return {(x.scene, x.view_layer): x.summary.problems for x in var.Report.get_file()}
+
+    def ignore(self, objects: Iterable[Object], codes: Iterable[int], mode: str = "SET") -> int:
+        """Replace, add or remove ignored problems of objects in bulk, legacy lists
+        of codes are converted to masks, return number of changed objects"""
+        from .snapshot import write_ignored
+
+        keep, add = problemlib.mode_masks(problemlib.to_mask(codes), mode)
+        changed = [ob for ob in objects if write_ignored(ob, keep, add)]
+
+        # ID property writes do not produce depsgraph updates
+        if changed:
+            var.Report.tag_objects(changed)
+            onscreen.wake()
+
+        return len(changed)
+
+    def report_dump(self, filepath: str, format: str = "JSON", rescan: bool = False) -> int:
+        """Write scan results to JSON or SARIF file, return number of findings"""
+        if rescan:
+            var.Report.get()
+
+        with open(filepath, "w", encoding="utf-8") as file:
+            return var.Report.export(file, format)
+
+    def generation(self) -> int:
+        """Number increased each time scan results change"""
+        return var.Report.generation
+
+    def stats(self, reset=False) -> dict:
+        cache = var.Report.cache
+        data = var.Report.stats.as_dict()
+        data["cache"] = {"size": len(cache), "maxsize": cache.maxsize, "hits": cache.hits, "misses": cache.misses}
+        data["startup"] = dict(var.Startup)
+
+        if reset:
+            var.Report.stats.clear()
+
+        return data
+
+    def stats_dump(self, filepath: str) -> None:
+        import json
+
+        with open(filepath, "w", encoding="utf-8") as file:
+            json.dump(self.stats(), file, indent=4)
+
 
 # Scene properties
 # ------------------------------------------
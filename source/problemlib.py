@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from collections.abc import Iterable
 from typing import NamedTuple
 
 
@@ -19,6 +20,11 @@ ID_CYCLIC_DEP = 202
 ID_CURVE_RADIUS = 301
 ID_CURVE_ORDER = 302
 ID_CURVE_RESOLUTION = 303
+ID_MESH_ZERO_AREA = 304
+ID_MESH_LOOSE_VERTS = 305
+ID_MESH_LOOSE_EDGES = 306
+ID_MESH_DOUBLES = 307
+ID_MESH_NON_MANIFOLD = 308
 
 # Scene
 ID_COLLECTION_NAME = 401
@@ -73,8 +79,10 @@ CyclicDep = Problem(
     TYPE_ERROR,
     "Cyclic dependency",
     (
-        "Using the same object as a target for Shrinkwrap and Boolean modifiers creates cyclic dependency."
-        "\n\nRecommendation: use a duplicate object without Boolean modifier as a target in Shrinkwrap modifier."
+        "Objects depending on each other through modifiers, constraints or parenting create cyclic dependency, "
+        "for example using the same object as a target for Shrinkwrap and Boolean modifiers."
+        "\n\nRecommendation: break the cycle, for example use a duplicate object without Boolean modifier "
+        "as a target in Shrinkwrap modifier."
     ),
 )
 
@@ -109,6 +117,60 @@ CurveResolution = Problem(
     ),
 )
 
+MeshZeroArea = Problem(
+    ID_MESH_ZERO_AREA,
+    TYPE_ERROR,
+    "Zero area faces",
+    (
+        "Faces with collapsed vertices or edges have no area and no valid normal, "
+        "they cause shading artifacts and break booleans and bevels."
+        "\n\nRecommendation: in Edit Mode use Mesh > Clean Up > Degenerate Dissolve."
+    ),
+)
+
+MeshLooseVerts = Problem(
+    ID_MESH_LOOSE_VERTS,
+    TYPE_WARN,
+    "Loose vertices",
+    (
+        "Vertices not connected to any edge are invisible in render and get in the way of editing."
+        "\n\nRecommendation: in Edit Mode use Select > Select All by Trait > Loose Geometry and delete them."
+    ),
+)
+
+MeshLooseEdges = Problem(
+    ID_MESH_LOOSE_EDGES,
+    TYPE_WARN,
+    "Loose edges",
+    (
+        "Edges not connected to any face are invisible in render and break modifiers which expect closed surface."
+        "\n\nRecommendation: in Edit Mode use Select > Select All by Trait > Loose Geometry and delete them, "
+        "unless they are used on purpose, for example as a skin or wireframe base."
+    ),
+)
+
+MeshDoubles = Problem(
+    ID_MESH_DOUBLES,
+    TYPE_ERROR,
+    "Coincident vertices",
+    (
+        "Vertices at the same location make mesh look connected when it is not, "
+        "which leads to seams after subdivision and failed booleans."
+        "\n\nRecommendation: in Edit Mode use Mesh > Clean Up > Merge by Distance."
+    ),
+)
+
+MeshNonManifold = Problem(
+    ID_MESH_NON_MANIFOLD,
+    TYPE_ERROR,
+    "Non-manifold edges",
+    (
+        "Edges shared by more than two faces do not describe a valid surface, "
+        "booleans, 3D printing and subdivision give unpredictable results on them."
+        "\n\nRecommendation: in Edit Mode use Select > Select All by Trait > Non Manifold and fix topology."
+    ),
+)
+
 CollectionName = Problem(
     ID_COLLECTION_NAME,
     TYPE_WARN,
@@ -129,5 +191,49 @@ coll = {
     CurveRadius.code: CurveRadius,
     CurveOrder.code: CurveOrder,
     CurveResolution.code: CurveResolution,
+    MeshZeroArea.code: MeshZeroArea,
+    MeshLooseVerts.code: MeshLooseVerts,
+    MeshLooseEdges.code: MeshLooseEdges,
+    MeshDoubles.code: MeshDoubles,
+    MeshNonManifold.code: MeshNonManifold,
     CollectionName.code: CollectionName,
 }
+
+# Bit per problem code, masks are stored in files so bits are never reassigned,
+# new problems take the next free bit, integer ID properties limit masks to 31 bits
+bits = {
+    ID_OB_SCALE: 1 << 0,
+    ID_OB_EMPTY: 1 << 1,
+    ID_MOD_ORDER: 1 << 2,
+    ID_CYCLIC_DEP: 1 << 3,
+    ID_CURVE_RADIUS: 1 << 4,
+    ID_CURVE_ORDER: 1 << 5,
+    ID_CURVE_RESOLUTION: 1 << 6,
+    ID_COLLECTION_NAME: 1 << 7,
+    ID_MESH_ZERO_AREA: 1 << 8,
+    ID_MESH_LOOSE_VERTS: 1 << 9,
+    ID_MESH_LOOSE_EDGES: 1 << 10,
+    ID_MESH_DOUBLES: 1 << 11,
+    ID_MESH_NON_MANIFOLD: 1 << 12,
+}
+
+# Code sets are shared between equal masks
+_sets: dict[int, frozenset[int]] = {}
+
+
+def to_mask(codes: Iterable[int]) -> int:
+    mask = 0
+    for code in codes:
+        mask |= bits.get(code, 0)
+    return mask
+
+
+def mode_masks(mask: int, mode: str) -> tuple[int, int]:
+    """Return bits kept and bits added when mask is applied in SET, ADD or REMOVE mode"""
+    return {"SET": (0, mask), "ADD": (-1, mask), "REMOVE": (~mask, 0)}[mode]
+
+
+def from_mask(mask: int) -> frozenset[int]:
+    if (codes := _sets.get(mask)) is None:
+        codes = _sets[mask] = frozenset(code for code, bit in bits.items() if mask & bit)
+    return codes
@@ -1,40 +1,364 @@
 # SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from collections.abc import Iterator
-from typing import Any
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import IO, Any, NamedTuple
 
 import bpy
-from bpy.types import Curve, LayerCollection, Object, ObjectModifiers
-from mathutils import Vector
+from bpy.types import Collection, Curve, Depsgraph, Mesh, Object
 
-from . import problemlib
+from . import checks, export, persist, problemlib, snapshot
+from .snapshot import CollectionRecord, DataRecord, ObjectRecord
 
 
-def _collection_walk(coll: LayerCollection) -> Iterator[LayerCollection]:
-    for subcoll in coll.children:
-        yield subcoll
-        if subcoll.children:
-            yield from _collection_walk(subcoll)
+# Full rescan is faster than incremental update past this number of changed IDs
+_DIRTY_LIMIT = 1000
 
 
-def _is_curve_bevel(curve: Curve) -> bool:
-    return curve.bevel_depth or curve.extrude or curve.bevel_object is not None
+def _context_key() -> tuple[int, str]:
+    return bpy.context.scene.session_uid, bpy.context.view_layer.name
 
 
-def _is_mod_solidify(modifiers: ObjectModifiers) -> bool:
-    for mod in modifiers:
-        if mod.type == "SOLIDIFY":
-            return True
-    return False
+def _disabled(prefs: bpy.types.AddonPreferences) -> frozenset[int]:
+    disabled = {code for code in problemlib.coll.keys() if not getattr(prefs, f"problem_{code}")}
+
+    if len(bpy.data.collections) < 2:
+        disabled.add(problemlib.ID_COLLECTION_NAME)
+
+    return frozenset(disabled)
+
+
+def _timed(stats: checks.Stats | None, name: str, func: Callable[..., Any], *args) -> Any:
+    if stats is None:
+        return func(*args)
+
+    start = time.perf_counter()
+    result = func(*args)
+    stats.add(name, time.perf_counter() - start)
+    return result
+
+
+class ResultCache:
+    """LRU shared by object pass worker threads, every access holds the lock"""
+
+    __slots__ = "maxsize", "hits", "misses", "_data", "_lock"
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[int, tuple[Hashable, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: int, fingerprint: Hashable) -> Any:
+        with self._lock:
+            if (item := self._data.get(key)) is not None and item[0] == fingerprint:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: int, fingerprint: Hashable, value: Any) -> None:
+        if not self.maxsize:
+            return
+
+        with self._lock:
+            self._data[key] = fingerprint, value
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key: int) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class _Hierarchy:
+    """Flattened collection tree of a view layer and check results per collection"""
+
+    __slots__ = "root", "records", "found", "dirty", "disabled", "excluded"
+
+    def __init__(self) -> None:
+        self.root: tuple[int, ...] = ()
+        self.records: list[CollectionRecord] = []
+        self.found: dict[int, frozenset[int]] = {}
+        self.dirty: set[int] = set()
+        self.disabled: frozenset[int] | None = None
+        self.excluded: frozenset[int] = frozenset()
+
+    def update(
+        self,
+        Check: checks.Detect,
+        layer_collection: bpy.types.LayerCollection,
+        excluded: frozenset[int] = frozenset(),
+    ) -> dict[int, int]:
+        """Re-check changed collections, tree is walked only when collections were added,
+        removed, renamed, relinked or excluded, or top level of the view layer differs"""
+        root = tuple(x.collection.session_uid for x in layer_collection.children)
+
+        if self.dirty or root != self.root or excluded != self.excluded:
+            self.root = root
+            self.excluded = excluded
+            self.records = snapshot.extract_collections(layer_collection, excluded)
+            recheck = self.dirty
+        elif self.disabled == Check.disabled:
+            return self.problems()
+        else:
+            recheck = set()
+
+        if self.disabled != Check.disabled:
+            self.disabled = Check.disabled
+            self.found.clear()
+
+        table, _ = Check.table("COLLECTION")
+        found = {}
+
+        for record in self.records:
+            if record.uid in recheck or (codes := self.found.get(record.uid)) is None:
+                codes = frozenset(Check.run(table, record))
+            found[record.uid] = codes
+
+        self.found = found
+        self.dirty = set()
+
+        return self.problems()
+
+    def problems(self) -> dict[int, int]:
+        """Return number of collections per problem code"""
+        counts = {}
+        for codes in self.found.values():
+            for code in codes:
+                counts[code] = counts.get(code, 0) + 1
+        return counts
+
+
+class _Exclusions(NamedTuple):
+    """Objects and collections of the scene Exceptions collection, nested children included"""
+
+    root: int | None
+    objects: frozenset[int]
+    collections: frozenset[int]
+
+    @classmethod
+    def resolve(cls, coll: Collection | None) -> "_Exclusions":
+        return cls(coll.session_uid if coll is not None else None, *snapshot.extract_exclusions(coll))
+
+
+class _Index:
+    __slots__ = (
+        "records",
+        "refs",
+        "found",
+        "flagged",
+        "coll_found",
+        "deformers",
+        "users",
+        "data",
+        "graph",
+        "cyclic",
+        "skipped",
+    )
+
+    def __init__(self) -> None:
+        self.records: dict[int, ObjectRecord] = {}
+        self.refs: dict[int, Object] = {}  # Flagged objects only
+        self.found: dict[int, frozenset[int]] = {}
+        self.flagged: set[int] = set()
+        self.coll_found: dict[int, int] = {}
+        self.deformers: dict[int, int] = {}
+        self.users: dict[int, set[int]] = {}
+        self.data: dict[int, DataRecord] = {}
+        self.graph: dict[int, frozenset[int]] = {}
+        self.cyclic: set[int] = set()
+        self.skipped = 0  # Excluded scene objects
+
+    def link(self, record: ObjectRecord) -> None:
+        uid = record.uid
+        if record.data is not None:
+            self.users.setdefault(record.data.uid, set()).add(uid)
+            self.data[record.data.uid] = record.data
+        for curve in record.curves:
+            self.deformers[curve] = self.deformers.get(curve, 0) + 1
+        for kind, deps in enumerate(record.deps):
+            if deps:
+                self.graph[uid << 1 | kind] = deps
+
+    def unlink(self, record: ObjectRecord) -> None:
+        uid = record.uid
+        if record.data is not None:
+            users = self.users[record.data.uid]
+            users.discard(uid)
+            if not users:
+                del self.users[record.data.uid]
+                self.data.pop(record.data.uid, None)
+        for curve in record.curves:
+            if self.deformers[curve] == 1:
+                del self.deformers[curve]
+            else:
+                self.deformers[curve] -= 1
+        for kind in (snapshot.TRANSFORM, snapshot.GEOMETRY):
+            self.graph.pop(uid << 1 | kind, None)
+
+    def relink(self, old: ObjectRecord | None, new: ObjectRecord | None) -> set[int]:
+        """Return curves which gained or lost deformer status"""
+        curves = (old.curves if old else frozenset()) | (new.curves if new else frozenset())
+        before = {x for x in curves if x in self.deformers}
+
+        if old is not None:
+            self.unlink(old)
+        if new is not None:
+            self.link(new)
+
+        return before ^ {x for x in curves if x in self.deformers}
+
+
+class Summary:
+    """Problems found on a set of objects and collections"""
+
+    __slots__ = (
+        "problems",
+        "problems_ignored",
+        "obs",
+        "obs_ignored",
+        "errors",
+        "warns",
+        "counts",
+        "counts_ignored",
+        "by_code",
+        "by_code_ignored",
+    )
+
+    def __init__(self, index: _Index, uids: Iterable[int], coll_found: dict[int, int]) -> None:
+        obs = []
+        obs_ignored = []
+        problems = []
+        problems_ignored = []
+        errors = 0
+        warns = 0
+        detected_problems = set(coll_found)
+        ignored_problems = set()
+
+        by_code = {}
+        by_code_ignored = {}
 
+        for uid in uids:
+            record = index.records[uid]
 
-def _is_gem_related(ob: Object) -> bool:
-    return "gem" in ob or (ob.parent is not None and "gem" in ob.parent)
+            if (found := index.found.get(uid)) is not None:
+                obs.append((record.name, found))
+                detected_problems |= found
+                for code in found:
+                    by_code.setdefault(code, []).append(uid)
+
+            if record.ignored:
+                ignored = problemlib.from_mask(record.ignored)
+                obs_ignored.append((record.name, ignored))
+                ignored_problems |= ignored
+                for code in ignored:
+                    by_code_ignored.setdefault(code, []).append(uid)
+
+        for problem in problemlib.coll.values():
+
+            if problem.code in detected_problems:
+                problems.append(problem)
+                if problem.type is problemlib.TYPE_ERROR:
+                    errors += 1
+                else:
+                    warns += 1
+
+            if problem.code in ignored_problems:
+                problems_ignored.append(problem)
+
+        problems.sort(key=lambda x: x.type)
+        problems_ignored.sort(key=lambda x: x.type)
+
+        self.problems = problems
+        self.problems_ignored = problems_ignored
+        self.obs = obs
+        self.obs_ignored = obs_ignored
+        self.errors = errors
+        self.warns = warns
+        self.counts = {code: len(uids) for code, uids in by_code.items()} | coll_found
+        self.counts_ignored = {code: len(uids) for code, uids in by_code_ignored.items()}
+        self.by_code = by_code
+        self.by_code_ignored = by_code_ignored
+
+    @property
+    def state(self) -> Hashable:
+        return (
+            tuple(self.problems),
+            tuple(self.problems_ignored),
+            frozenset(self.obs),
+            frozenset(self.obs_ignored),
+            tuple(sorted(self.counts.items())),
+        )
+
+
+class Group(NamedTuple):
+    scene: str
+    view_layer: str
+    summary: Summary
 
 
 class Scan:
-    __slots__ = "problems", "problems_ignored", "obs", "obs_ignored", "errors", "warns"
+    __slots__ = (
+        "problems",
+        "problems_ignored",
+        "obs",
+        "obs_ignored",
+        "errors",
+        "warns",
+        "counts",
+        "counts_ignored",
+        "progress",
+        "generation",
+        "cache",
+        "stats",
+        "file",
+        "timing",
+        "_index",
+        "_job",
+        "_pool",
+        "_pool_size",
+        "_dirty",
+        "_dirty_data",
+        "_dirty_colls",
+        "_hierarchies",
+        "_restored",
+        "_exclusions",
+        "_exclusions_dirty",
+        "_excluded",
+        "_full",
+        "_context",
+        "_disabled",
+        "_state",
+        "_by_code",
+        "_by_code_ignored",
+    )
 
     def __init__(self) -> None:
         self.problems = []
@@ -43,6 +367,33 @@ class Scan:
         self.obs_ignored = []
         self.errors = 0
         self.warns = 0
+        self.counts: dict[int, int] = {}
+        self.counts_ignored: dict[int, int] = {}
+        self.progress: float | None = None
+        self.generation = 0
+        self.cache = ResultCache(200_000)
+        self.stats = checks.Stats()
+        self.file: list[Group] = []
+        self.timing = {"scan": 0.0, "update": 0.0}  # Wall time of last full scan and update
+
+        self._index = _Index()
+        self._job: Iterator[str | None] | None = None
+        self._pool: Executor | None = None
+        self._pool_size = 0
+        self._dirty: set[int] = set()
+        self._dirty_data: set[int] = set()
+        self._dirty_colls = False
+        self._hierarchies: dict[tuple[int, str], _Hierarchy] = {}
+        self._restored: dict[str, persist.Entry] = {}
+        self._exclusions: dict[int, _Exclusions] = {}
+        self._exclusions_dirty: set[int] = set()
+        self._excluded = _Exclusions.resolve(None)
+        self._full = True
+        self._context = None
+        self._disabled = None
+        self._state = None
+        self._by_code: dict[int, list[int]] = {}
+        self._by_code_ignored: dict[int, list[int]] = {}
 
     def cleanup(self) -> None:
         self.problems.clear()
@@ -51,193 +402,689 @@ class Scan:
         self.obs_ignored.clear()
         self.errors = 0
         self.warns = 0
+        self.counts = {}
+        self.counts_ignored = {}
+        self.progress = None
+        self.generation += 1
+        self.file = []
+        self._state = None
+        self._by_code.clear()
+        self._by_code_ignored.clear()
+
+        self._index = _Index()
+        self._cancel()
+        self._dirty.clear()
+        self._dirty_data.clear()
+        self._dirty_colls = False
+        self._hierarchies.clear()
+        self._restored = {}
+        self._exclusions.clear()
+        self._exclusions_dirty.clear()
+        self._full = True
+
+    def shutdown(self) -> None:
+        """Cancel scan in flight and stop worker threads"""
+        self._cancel()
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._pool_size = 0
+
+    def _executor(self, workers: int) -> Executor | None:
+        """Return thread pool for the object pass, None for synchronous scan"""
+        if workers != self._pool_size:
+            self.shutdown()
+
+            if workers:
+                from concurrent.futures import ThreadPoolExecutor
+                self._pool = ThreadPoolExecutor(workers, thread_name_prefix="sidekick")
+                self._pool_size = workers
+
+        return self._pool
+
+    # Change tracking
+    # ----------------------------
+
+    def tag_objects(self, obs: Iterable[Object]) -> None:
+        self._dirty.update(ob.session_uid for ob in obs)
+        self.file = []
+
+    def tag_full(self) -> None:
+        self._full = True
+        self.file = []
+        self._hierarchies.clear()
+        self._exclusions.clear()
+        self._exclusions_dirty.clear()
+
+    def tag_updates(self, depsgraph: Depsgraph) -> None:
+        # Results of the whole file are not kept up to date
+        if self.file and depsgraph.updates:
+            self.file = []
+
+        if self._exclusions:
+            for update in depsgraph.updates:
+                if isinstance(id_data := update.id.original, Collection):
+                    uid = id_data.session_uid
+                    for scene, exclusions in self._exclusions.items():
+                        if uid in exclusions.collections:
+                            self._exclusions_dirty.add(scene)
+
+        if self._full:
+            return
+
+        for update in depsgraph.updates:
+            id_data = update.id.original
+
+            if isinstance(id_data, Object):
+                self._dirty.add(id_data.session_uid)
+            elif isinstance(id_data, (Mesh, Curve)):
+                self._dirty_data.add(id_data.session_uid)
+            elif isinstance(id_data, Collection):
+                self._dirty_colls = True
+                for hierarchy in self._hierarchies.values():
+                    hierarchy.dirty.add(id_data.session_uid)
+
+    def _exclusions_get(self, scene: bpy.types.Scene) -> _Exclusions:
+        """Resolved exclusions are reused until membership of the collection tree changes"""
+        coll = scene.sidekick.exceptions
+        uid = coll.session_uid if coll is not None else None
+
+        key = scene.session_uid
+        exclusions = self._exclusions.get(key)
+
+        if exclusions is None or exclusions.root != uid or key in self._exclusions_dirty:
+            self._exclusions_dirty.discard(key)
+            resolved = _Exclusions.resolve(coll)
+            # Same membership keeps the instance, scan is not restarted
+            if resolved != exclusions:
+                exclusions = self._exclusions[key] = resolved
+
+        return exclusions
+
+    # Scan
+    # ----------------------------
+
+    def _detect(self) -> tuple[bpy.types.AddonPreferences, checks.Detect]:
+        prefs = bpy.context.preferences.addons[__package__].preferences
+        self.cache.resize(prefs.cache_size)
+        return prefs, checks.Detect(_disabled(prefs), self.stats if prefs.use_stats else None)
 
     def get(self) -> None:
-        self.cleanup()
-        scene = bpy.context.scene
-        detected_problems = set()
-        ignored_problems = set()
-        Check = _Detect()
+        _, Check = self._detect()
+        self._start(Check)
+        self._step(Check, float("inf"))
 
-        # Collection pass
+    def get_file(self) -> list[Group]:
+        """Scan every scene and view layer of the file, objects and data shared between scenes
+        are evaluated once, deformers and dependency cycles are resolved across the whole file"""
+        _, Check = self._detect()
+        self.file = _timed(Check.stats, "file", self._file_pass, Check)
+        return self.file
+
+    def _file_pass(self, Check: checks.Detect) -> list[Group]:
+        index = _Index()
+        members = []
+        coll_uids = {}
+
+        def collection_members(coll: Collection) -> set[int]:
+            """Object UIDs of collection and its children, computed once per collection"""
+            if (uids := coll_uids.get(coll.session_uid)) is None:
+                uids = coll_uids[coll.session_uid] = set(snapshot.read_uids(coll.all_objects).tolist())
+            return uids
+
+        for scene in bpy.data.scenes:
+            root = scene.collection
+            exclusions = self._exclusions_get(scene)
+            uids = {ob.session_uid for ob in root.objects}
+            for child in root.children:
+                if child.session_uid not in exclusions.collections:
+                    uids |= collection_members(child)
+            members.append((scene, uids - exclusions.objects, exclusions.collections))
+
+        used = set().union(*(uids for _, uids, _ in members))
+
+        # Extraction
         # ----------------------------
 
-        for coll in _collection_walk(bpy.context.view_layer.layer_collection):
-            Check.do(problemlib.ID_COLLECTION_NAME, coll)
+        data_obs = bpy.data.objects
+        scales = snapshot.read_scales(data_obs)
+        is_scaled = checks.scaled_mask(scales).tolist()
+        scales = scales.tolist()
+        records = []
+
+        for i, ob in enumerate(data_obs):
+            if ob.session_uid not in used:
+                continue
+
+            record = snapshot.extract_object(ob, scales[i], self._data_record(Check, index, ob))
+            index.records[record.uid] = record
+            index.link(record)
+            records.append((record, ob, is_scaled[i]))
+
+        index.cyclic = checks.find_cycles(index.graph)
 
-        detected_problems |= Check.found
+        for record, ob, scaled in records:
+            self._check(Check, index, record, ob, scaled)
 
-        # Object prepass
+        # Report per view layer
         # ----------------------------
 
-        deformer_curves = set()
+        groups = []
 
-        for ob in scene.objects:
-            for mod in ob.modifiers:
-                if mod.type == "CURVE" and mod.object:
-                    deformer_curves.add(mod.object)
+        for scene, uids, excluded in members:
+            flagged = index.flagged & uids
+
+            for view_layer in scene.view_layers:
+                key = scene.session_uid, view_layer.name
+                if (hierarchy := self._hierarchies.get(key)) is None:
+                    hierarchy = self._hierarchies[key] = _Hierarchy()
+                coll_found = hierarchy.update(Check, view_layer.layer_collection, excluded)
+
+                groups.append(Group(scene.name, view_layer.name, Summary(index, flagged, coll_found)))
+
+        return groups
+
+    def update(self) -> bool:
+        """Return True if scene changes were processed"""
+        prefs, Check = self._detect()
+
+        if (
+            self._full or
+            self._context != _context_key() or
+            self._disabled != Check.disabled or
+            self._excluded != self._exclusions_get(bpy.context.scene) or
+            (self._job is None and len(self._dirty) + len(self._dirty_data) > _DIRTY_LIMIT)
+        ):
+            self._start(Check, self._executor(prefs.scan_threads))
+
+        if self._job is not None:
+            self._step(Check, prefs.scan_budget / 1000)
+            return True
+
+        if not (self._dirty or self._dirty_data or self._dirty_colls):
+            return False
+
+        _timed(Check.stats, "update", self._update, Check)
+        return True
+
+    def _start(self, Check: checks.Detect, executor: Executor | None = None) -> None:
+        """Start full scan, object pass runs on executor threads if given"""
+        self._cancel()
+        self._context = _context_key()
+        self._excluded = self._exclusions_get(bpy.context.scene)
+        self._dirty.clear()
+        self._dirty_data.clear()
+        self._dirty_colls = False
+        self._full = False
+
+        if self._disabled != Check.disabled:
+            self._disabled = Check.disabled
+            self.cache.clear()
+
+        self.stats.cancel()
+        self.progress = 0.0
+        self._job = self._scan(Check, executor)
+
+    def _cancel(self) -> None:
+        """Superseded job is closed, analysis in flight stops before the next object"""
+        if self._job is not None:
+            self._job.close()
+            self._job = None
+
+    def _step(self, Check: checks.Detect, budget: float) -> None:
+        stats = Check.stats
+        now = time.perf_counter()
+        deadline = now + budget
+
+        # Job yields name of the pass it is in, or None while waiting for worker threads
+        for name in self._job:
+            if name is None:
+                return
+
+            then, now = now, time.perf_counter()
+            if stats is not None:
+                stats.tick(name, now - then)
+            if now > deadline:
+                return
+
+        self._job = None
+        self.progress = None
+
+    def _scan(self, Check: checks.Detect, executor: Executor | None = None) -> Iterator[str | None]:
+        """Resumable full scan, result replaces current report when the job is exhausted"""
+        time_start = time.perf_counter()
+        index = _Index()
+        stats = Check.stats
+
+        # Collection pass
+        # ----------------------------
+
+        index.coll_found = _timed(stats, "collections", self._collection_pass, Check)
+
+        # Extraction
+        # ----------------------------
+
+        scene_obs = bpy.context.scene.objects
+        scales = snapshot.read_scales(scene_obs)
+        obs = list(zip(scene_obs, scales.tolist(), checks.scaled_mask(scales).tolist()))
+
+        # Excluded objects are dropped before any extraction
+        if excluded := self._excluded.objects:
+            uids = snapshot.read_uids(scene_obs).tolist()
+            obs = [x for x, uid in zip(obs, uids) if uid not in excluded]
+            index.skipped = len(uids) - len(obs)
+
+        records = []
+        step = 0.5 / (len(obs) or 1)
+
+        for ob, scale, scaled in obs:
+            try:
+                record = snapshot.extract_object(ob, scale, self._data_record(Check, index, ob))
+            except ReferenceError:
+                continue  # Removed while the job was in flight
+
+            index.records[record.uid] = record
+            index.link(record)
+            records.append((record, ob, scaled))
+
+            self.progress += step
+            yield "prepass"
+
+        if stats is not None:
+            stats.close("prepass")
 
         # Object pass
         # ----------------------------
 
-        for ob in scene.objects:
-            Check.found = set()
-            Check.ignored = set(ob["sidekick_ignore"]) if "sidekick_ignore" in ob else set()
+        if executor is not None:
+            yield from self._analyze(executor, Check, index, records)
+        else:
+            index.cyclic = _timed(stats, "cycles", checks.find_cycles, index.graph)
+
+            for record, ob, scaled in records:
+                self._check(Check, index, record, ob, scaled)
+
+                self.progress += step
+                yield "objects"
+
+            if stats is not None:
+                stats.close("objects")
+
+        self._index = index
+        self._restored = {}
+        self.timing["scan"] = time.perf_counter() - time_start
+        _timed(stats, "assembly", self._assemble)
+
+    def _analyze(self, executor: Executor, Check: checks.Detect, index: _Index, records: list) -> Iterator[None]:
+        """Cycle detection and object pass on worker threads, records are split into one chunk
+        per worker. Extracted records are not touched by the main thread until the job is done"""
+        stats = Check.stats
+        time_start = time.perf_counter()
+        cancelled = threading.Event()
+        futures = []
+
+        num = max(1, min(self._pool_size, len(records)))
+        done = [0] * num
+
+        def run(Fork: checks.Detect, i: int) -> None:
+            for record, ob, scaled in records[i::num]:
+                if cancelled.is_set():
+                    return
+                self._check(Fork, index, record, ob, scaled)
+                done[i] += 1
 
-            if not Check.do(problemlib.ID_OB_EMPTY, ob):
+        try:
+            futures.append(executor.submit(_timed, stats, "cycles", checks.find_cycles, index.graph))
+            while not futures[0].done():
+                yield None
+            index.cyclic = futures[0].result()
 
-                if ob.type in {"CURVE", "FONT"}:
-                    if _is_curve_bevel(ob.data) or (ob.modifiers and _is_mod_solidify(ob.modifiers)):
-                        Check.do(problemlib.ID_OB_SCALE, ob.scale)
-                    if ob in deformer_curves:
-                        Check.do(problemlib.ID_CURVE_RADIUS, ob.data)
-                        Check.do(problemlib.ID_CURVE_RESOLUTION, ob.data)
-                    Check.do(problemlib.ID_CURVE_ORDER, ob.data)
+            futures = [executor.submit(run, Check.fork(), i) for i in range(num)]
+            progress = self.progress
+            step = 0.5 / (len(records) or 1)
 
-                elif ob.type == "MESH":
-                    if not _is_gem_related(ob):
-                        Check.do(problemlib.ID_OB_SCALE, ob.scale)
-                    if ob.modifiers:
-                        Check.do(problemlib.ID_MOD_ORDER, ob.modifiers)
-                        Check.do(problemlib.ID_CYCLIC_DEP, ob)
+            while not all(x.done() for x in futures):
+                self.progress = progress + step * sum(done)
+                yield None
 
-            if Check.found:
-                self.obs.append((ob.name, Check.found))
-                detected_problems |= Check.found
+            for future in futures:
+                future.result()
+        finally:
+            cancelled.set()
+            for future in futures:
+                future.cancel()
 
-            if Check.ignored:
-                self.obs_ignored.append((ob.name, Check.ignored))
-                ignored_problems |= Check.ignored
+        if stats is not None:
+            stats.add("analysis", time.perf_counter() - time_start)
 
-        # Report
+    def _update(self, Check: checks.Detect) -> None:
+        time_start = time.perf_counter()
+        scene = bpy.context.scene
+        index = self._index
+        excluded = self._excluded.objects
+        dirty = self._dirty
+        dirty -= excluded
+        for data in self._dirty_data:
+            index.data.pop(data, None)
+            dirty |= index.users.get(data, ())
+
+        # Collection pass
         # ----------------------------
 
-        for problem in problemlib.coll.values():
+        if self._dirty_colls:
+            index.coll_found = _timed(Check.stats, "collections", self._collection_pass, Check)
 
-            if problem.code in detected_problems:
-                self.problems.append(problem)
-                if problem.type is problemlib.TYPE_ERROR:
-                    self.errors += 1
-                else:
-                    self.warns += 1
+        # Resolve changed objects
+        # ----------------------------
 
-            if problem.code in ignored_problems:
-                self.problems_ignored.append(problem)
+        def scene_map() -> dict[int, Object]:
+            return {uid: ob for ob in scene.objects if (uid := ob.session_uid) not in excluded}
 
-        self.problems.sort(key=lambda x: x.type)
-        self.problems_ignored.sort(key=lambda x: x.type)
+        scene_obs = None
 
+        if (
+            self._dirty_colls or
+            len(dirty) > 32 or
+            not dirty <= index.records.keys() or
+            len(scene.objects) != len(index.records) + index.skipped
+        ):
+            scene_obs = scene_map()
+            index.skipped = len(scene.objects) - len(scene_obs)
+            dirty |= scene_obs.keys() ^ index.records.keys()
 
-class _Detect:
-    __slots__ = "found", "_ignored", "_disabled", "_excluded"
-    found: set
-    _ignored: set
-    _disabled: set
-    _excluded: set
+        def resolve(uid: int) -> Object | None:
+            nonlocal scene_obs
 
-    def __init__(self) -> None:
-        prefs = bpy.context.preferences.addons[__package__].preferences
-        self.found = set()
-        self._disabled = {code for code in problemlib.coll.keys() if not getattr(prefs, f"problem_{code}")}
+            if scene_obs is None:
+                if (record := index.records.get(uid)) is None:
+                    return None
+                if (ob := scene.objects.get(record.name)) is not None and ob.session_uid == uid:
+                    return ob
+                # Renamed since it was extracted, name lookup is replaced by UID lookup
+                scene_obs = scene_map()
 
-        if len(bpy.data.collections) < 2:
-            self._disabled.add(problemlib.ID_COLLECTION_NAME)
+            return scene_obs.get(uid)
 
-        self._excluded = self._disabled
+        # Object pass
+        # ----------------------------
 
-    @property
-    def ignored(self) -> set:
-        return self._ignored
+        queue = {uid: resolve(uid) for uid in dirty}
+        is_graph_changed = False
 
-    @ignored.setter
-    def ignored(self, value: set) -> None:
-        self._ignored = value
-        self._excluded = self._disabled | value
+        while queue:
+            uid, ob = queue.popitem()
+            record = None
+            if ob is not None:
+                record = snapshot.extract_object(ob, data_record=self._data_record(Check, index, ob))
+            record_old = index.records.pop(uid, None)
+            affected = index.relink(record_old, record)
 
-    def do(self, code: int, value: Any) -> bool:
-        if code not in self._excluded and getattr(self, f"_{code}")(value):
-            self.found.add(code)
-            return True
-        return False
+            if record is not None:
+                index.records[uid] = record
+                self._check(Check, index, record, ob, checks.is_scaled(record.scale))
+            else:
+                index.found.pop(uid, None)
+                index.flagged.discard(uid)
+                index.refs.pop(uid, None)
 
-    @staticmethod
-    def _101(scale: Vector) -> bool:
-        return abs(scale.length_squared - 3.0) > 1e-6
+            if (record_old.deps if record_old else None) != (record.deps if record else None):
+                is_graph_changed = True
 
-    @staticmethod
-    def _102(ob: Object) -> bool:
-        methods = {
-            "CURVE": lambda ob: not ob.data.splines,
-            "MESH": lambda ob: not ob.data.vertices,
-        }
+            for dep in affected:
+                if dep in index.records:
+                    queue[dep] = resolve(dep)
 
-        if (is_empty := methods.get(ob.type)) and is_empty(ob):
-            if ob.modifiers:
-                for mod in ob.modifiers:
-                    if (
-                        mod.type == "NODES" or
-                        (mod.type == "BOOLEAN" and mod.operation == "UNION" and mod.object)
-                    ):
-                        return False
-            return True
+            if is_graph_changed and not queue:
+                is_graph_changed = False
+                cyclic = _timed(Check.stats, "cycles", checks.find_cycles, index.graph)
+                for dep in cyclic ^ index.cyclic:
+                    if dep in index.records:
+                        queue[dep] = resolve(dep)
+                index.cyclic = cyclic
 
-        return False
+        self._dirty.clear()
+        self._dirty_data.clear()
+        self._dirty_colls = False
+        self.timing["update"] = time.perf_counter() - time_start
+        _timed(Check.stats, "assembly", self._assemble)
 
-    @staticmethod
-    def _201(modifiers: ObjectModifiers) -> bool:
-        trigger = False
-        trigger_mods = {"CURVE", "LATTICE", "SHRINKWRAP", "SIMPLE_DEFORM", "BOOLEAN", "NODES"}
-
-        for mod in modifiers:
-            if mod.type in trigger_mods:
-                if mod.type == "NODES":
-                    if mod.node_group and "booltron" in mod.node_group:
-                        trigger = True
-                else:
-                    trigger = True
-            elif mod.type == "SUBSURF" and trigger:
-                return True
+    def _collection_pass(self, Check: checks.Detect) -> dict[int, int]:
+        if (hierarchy := self._hierarchies.get(self._context)) is None:
+            hierarchy = self._hierarchies[self._context] = _Hierarchy()
+        return hierarchy.update(Check, bpy.context.view_layer.layer_collection, self._excluded.collections)
 
-        return False
+    def _data_record(self, Check: checks.Detect, index: _Index, ob: Object) -> DataRecord | None:
+        """Extract object data once for all users, unchanged data keeps
+        record of the previous scan with memoized geometry analysis"""
+        if ob.data is None:
+            return None
 
-    @staticmethod
-    def _202(ob: Object) -> bool:
-        for mod in ob.modifiers:
-            if mod.type == "SHRINKWRAP" and mod.target:
-                for tmod in mod.target.modifiers:
-                    if tmod.type == "BOOLEAN":
-                        return (
-                            tmod.object == ob or
-                            ob in {
-                                mod.object for mod in tmod.object.modifiers
-                                if mod.type == "BOOLEAN"
-                            }
-                        )
-                break
-
-        return False
+        uid = ob.data.session_uid
 
-    @staticmethod
-    def _301(curve: Curve) -> bool:
-        if curve.use_radius and curve.splines:
-            for p in (curve.splines[0].bezier_points or curve.splines[0].points):
-                if p.radius != 1.0:
-                    return True
+        if (record := index.data.get(uid)) is None:
+            record = snapshot.extract_data(ob, not checks.GEOMETRY_CHECKS <= Check.disabled)
+            previous = self._index.data.get(uid)
+            if previous is not None and previous.key == record.key and Check.analyze(previous):
+                record = previous
+            else:
+                # Geometry arrays are not kept past extraction
+                Check.analyze(record)
 
-        return False
+        return record
 
     @staticmethod
-    def _302(curve: Curve) -> bool:
-        for spline in curve.splines:
-            if spline.points and spline.order_u < 4:
-                return True
+    def _fingerprint_stored(index: _Index, record: ObjectRecord) -> bytes:
+        """Fingerprint kept between sessions, UIDs are replaced by names"""
+        records = index.records
+        data = record.data
 
-        return False
+        return persist.fingerprint((
+            record.type,
+            record.scale,
+            (data.name, data.key[1:]) if data is not None else None,  # Data key starts with UID
+            tuple(
+                (mod.type, mod.operation, records[mod.object].name if mod.object in records else None, mod.booltron)
+                for mod in record.modifiers
+            ),
+            record.ignored,
+            record.uid in index.deformers,
+            record.gem,
+        ))
 
     @staticmethod
-    def _303(curve: Curve) -> bool:
-        return curve.splines[0].type != "POLY" and curve.resolution_u < 64
+    def _fingerprint(index: _Index, record: ObjectRecord) -> Hashable:
+        return (
+            record.type,
+            record.scale,
+            record.data.key if record.data is not None else None,
+            tuple(mod.key for mod in record.modifiers),
+            record.ignored,
+            record.uid in index.deformers,
+            record.gem,
+        )
 
-    @staticmethod
-    def _401(coll: LayerCollection) -> bool:
-        return coll.name.startswith("Collection")
+    def _check(
+        self,
+        Check: checks.Detect,
+        index: _Index,
+        record: ObjectRecord,
+        ob: Object,
+        is_scaled: bool,
+    ) -> None:
+        uid = record.uid
+        cacheable, relations = Check.table(record.type, record.ignored)
+        Check.uid = uid
+        Check.is_scaled = is_scaled
+        Check.deformers = index.deformers
+        Check.cyclic = index.cyclic
+
+        fingerprint = self._fingerprint(index, record)
+
+        if (found := self.cache.get(uid, fingerprint)) is None:
+            if (
+                (stored := self._restored.pop(record.name, None)) is not None and
+                stored.fingerprint == self._fingerprint_stored(index, record)
+            ):
+                found = problemlib.from_mask(stored.found) - checks.RELATION_CHECKS
+            else:
+                found = frozenset(Check.run(cacheable, record))
+            self.cache.set(uid, fingerprint, found)
+
+        if relations:
+            found |= Check.run(relations, record)
+
+        if found:
+            index.found[uid] = found
+        else:
+            index.found.pop(uid, None)
+
+        if found or record.ignored:
+            index.flagged.add(uid)
+            index.refs[uid] = ob
+        else:
+            index.flagged.discard(uid)
+            index.refs.pop(uid, None)
+
+    # Stored results
+    # ----------------------------
+
+    def persist(self) -> None:
+        """Store results of the last full scan in the scene"""
+        scene = bpy.context.scene
+        prefs = bpy.context.preferences.addons[__package__].preferences
+
+        if not prefs.use_persist:
+            if persist.PROP in scene:
+                del scene[persist.PROP]
+            return
+
+        # Unfinished or outdated results keep previously stored payload
+        if self._job is not None or self._full or self._context != _context_key():
+            return
+
+        index = self._index
+        entries = (
+            (
+                record.name,
+                persist.Entry(
+                    self._fingerprint_stored(index, record),
+                    problemlib.to_mask(index.found.get(record.uid, ())),
+                    record.ignored,
+                ),
+            )
+            for record in index.records.values()
+        )
+        tag = persist.tag(export.addon_version(), self._disabled)
+        scene[persist.PROP] = persist.encode(tag, bpy.context.view_layer.name, entries, index.coll_found)
+
+    def restore(self) -> bool:
+        """Show results stored in the file until the first scan replaces them,
+        the scan reuses stored results of objects which fingerprint still matches"""
+        self._restored = {}
+        scene = bpy.context.scene
+        prefs, Check = self._detect()
+
+        if not prefs.use_persist or (data := scene.get(persist.PROP)) is None:
+            return False
+
+        if (payload := persist.decode(bytes(data), persist.tag(export.addon_version(), Check.disabled))) is None:
+            return False
+
+        self._restored = payload.objects
+
+        if payload.view_layer != bpy.context.view_layer.name:
+            return False
+
+        index = _Index()
+        index.coll_found = payload.coll_found
+        obs = None
+
+        for name, entry in payload.objects.items():
+            if not (entry.found or entry.ignored):
+                continue
+
+            if obs is None:
+                obs = {ob.name: ob for ob in scene.objects}
+            if (ob := obs.get(name)) is None:
+                continue
+
+            uid = ob.session_uid
+            index.records[uid] = ObjectRecord(uid, name, ob.type, ignored=entry.ignored)
+            index.flagged.add(uid)
+            index.refs[uid] = ob
+            if entry.found:
+                index.found[uid] = problemlib.from_mask(entry.found)
+
+        self._index = index
+        self._assemble()
+        return True
+
+    # Report
+    # ----------------------------
+
+    def _assemble(self) -> None:
+        """Rebuild report, generation is increased only if the result differs"""
+        index = self._index
+        summary = Summary(index, index.flagged, index.coll_found)
+
+        # Object references may change without changing the report
+        self._by_code = summary.by_code
+        self._by_code_ignored = summary.by_code_ignored
+
+        state = summary.state
+
+        if state == self._state:
+            return
+
+        self._state = state
+        self.generation += 1
+        self.problems = summary.problems
+        self.problems_ignored = summary.problems_ignored
+        self.obs = summary.obs
+        self.obs_ignored = summary.obs_ignored
+        self.errors = summary.errors
+        self.warns = summary.warns
+        self.counts = summary.counts
+        self.counts_ignored = summary.counts_ignored
+
+    def findings(self) -> Iterator[export.Finding]:
+        """Problems of the current report per object in scene order, then per collection"""
+        index = self._index
+
+        for record in index.records.values():
+            if record.uid not in index.flagged:
+                continue
+
+            datablock = record.data.name if record.data is not None else None
+
+            for code in sorted(index.found.get(record.uid, ())):
+                yield export.Finding(code, False, record.name, datablock)
+            for code in sorted(problemlib.from_mask(record.ignored)):
+                yield export.Finding(code, True, record.name, datablock)
+
+        if (hierarchy := self._hierarchies.get(self._context)) is not None:
+            for record in hierarchy.records:
+                for code in sorted(hierarchy.found.get(record.uid, ())):
+                    yield export.Finding(code, False, collection=record.name)
+
+    def export(self, file: IO[str], format: str = "JSON") -> int:
+        """Stream current report to file in JSON or SARIF format, return number of findings"""
+        filepath = bpy.data.filepath
+        info = {
+            "tool": "Sidekick",
+            "version": export.addon_version(),
+            "file": filepath,
+            "uri": Path(filepath).as_uri() if filepath else None,
+            "scene": bpy.context.scene.name,
+            "view_layer": bpy.context.view_layer.name,
+            "errors": self.errors,
+            "warnings": self.warns,
+            "timing": dict(self.timing),
+        }
+        return export.WRITERS[format](file, self.findings(), info)
+
+    def objects(self, code: int, ignored: bool = False) -> list[Object]:
+        """Return objects with given problem, found or ignored"""
+        refs = self._index.refs
+        return [refs[uid] for uid in (self._by_code_ignored if ignored else self._by_code).get(code, ())]
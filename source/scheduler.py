@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+INTERVAL_MIN = 1.0
+INTERVAL_MAX = 16.0
+INTERVAL_SLICE = 0.01
+
+
+class Scheduler:
+    """Backoff grows while the scene is idle, interval is backoff
+    stretched by the least wait that keeps scanning within duty limit"""
+
+    __slots__ = "interval", "backoff", "wait_min", "duration", "duty", "paused"
+
+    def __init__(self) -> None:
+        self.interval = INTERVAL_MIN
+        self.backoff = INTERVAL_MIN
+        self.wait_min = 0.0
+        self.duration = 0.0
+        self.duty = 0.0
+        self.paused = False
+
+    @property
+    def is_idle(self) -> bool:
+        return self.backoff > INTERVAL_MIN
+
+    def reset(self) -> None:
+        """Undo idle backoff, duty limit still applies"""
+        self.backoff = INTERVAL_MIN
+        self.interval = max(INTERVAL_MIN, self.wait_min)
+
+    def suspend(self) -> float:
+        self.backoff = self.interval = INTERVAL_MAX
+        return self.interval
+
+    def pause(self) -> float:
+        self.paused = True
+        self.backoff = self.interval = INTERVAL_MIN
+        return self.interval
+
+    def next(self, duration: float, active: bool, duty_max: float, pending: bool = False) -> float:
+        self.paused = False
+        self.duration = duration
+
+        if pending:
+            self.backoff = INTERVAL_SLICE
+        elif active:
+            self.backoff = INTERVAL_MIN
+        else:
+            self.backoff = min(self.backoff * 2.0, INTERVAL_MAX)
+
+        # Keep share of wall time spent on scanning under duty_max
+        self.wait_min = duration * (1.0 - duty_max) / duty_max
+        self.interval = max(self.backoff, self.wait_min)
+        self.duty = duration / (duration + self.interval)
+
+        return self.interval
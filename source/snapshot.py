@@ -0,0 +1,437 @@
+# SPDX-FileCopyrightText: 2020-2024 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Plain records of scene state, checks run against these instead of Blender data,
+# so the same engine works inside Blender, in plain CPython and in worker processes.
+# Module must not import bpy, extraction functions only access attributes of the objects passed to them.
+
+import zlib
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+import numpy as np
+
+from . import problemlib
+
+
+# Object custom properties of ignored problems, mask replaces legacy list of codes
+IGNORE_PROP = "sidekick_ignore_mask"
+IGNORE_PROP_LEGACY = "sidekick_ignore"
+
+# Dependency graph nodes, two per object
+TRANSFORM = 0
+GEOMETRY = 1
+
+# Object pointer properties of modifiers and part of the target they depend on
+_MOD_TARGETS = {
+    "ARMATURE": (("object", TRANSFORM),),
+    "ARRAY": (("offset_object", TRANSFORM), ("start_cap", GEOMETRY), ("end_cap", GEOMETRY)),
+    "BOOLEAN": (("object", GEOMETRY),),
+    "CAST": (("object", TRANSFORM),),
+    "CURVE": (("object", GEOMETRY),),
+    "DATA_TRANSFER": (("object", GEOMETRY),),
+    "DISPLACE": (("texture_coords_object", TRANSFORM),),
+    "HOOK": (("object", TRANSFORM),),
+    "LATTICE": (("object", GEOMETRY),),
+    "MESH_DEFORM": (("object", GEOMETRY),),
+    "MIRROR": (("mirror_object", TRANSFORM),),
+    "SCREW": (("object", TRANSFORM),),
+    "SHRINKWRAP": (("target", GEOMETRY), ("auxiliary_target", GEOMETRY)),
+    "SIMPLE_DEFORM": (("origin", TRANSFORM),),
+    "SURFACE_DEFORM": (("target", GEOMETRY),),
+    "WARP": (("object_from", TRANSFORM), ("object_to", TRANSFORM)),
+    "WAVE": (("start_position_object", TRANSFORM),),
+}
+
+# Constraints depending on target geometry rather than transform
+_CON_GEOMETRY = {"CLAMP_TO", "FOLLOW_PATH", "SHRINKWRAP"}
+
+
+# Records
+# ----------------------------
+
+
+class CollectionRecord:
+    __slots__ = "name", "uid", "parent"
+
+    def __init__(self, name: str, uid: int = 0, parent: int | None = None) -> None:
+        self.name = name
+        self.uid = uid
+        self.parent = parent
+
+
+class ModifierRecord:
+    __slots__ = "type", "operation", "object", "booltron"
+
+    def __init__(
+        self,
+        type: str,
+        operation: str | None = None,
+        object: int | None = None,
+        booltron: bool = False,
+    ) -> None:
+        self.type = type
+        self.operation = operation
+        self.object = object
+        self.booltron = booltron
+
+    @property
+    def key(self) -> Hashable:
+        return self.type, self.operation, self.object, self.booltron
+
+
+class MeshGeometry:
+    """Vertex positions and topology as flat arrays, faces are stored as consecutive
+    runs of corners, analysis results are memoized per check. Arrays are released
+    once enabled checks are memoized, key and results are kept"""
+
+    __slots__ = "co", "edges", "corner_verts", "corner_edges", "face_sizes", "key", "memo"
+
+    def __init__(
+        self,
+        co: np.ndarray,
+        edges: np.ndarray,
+        corner_verts: np.ndarray,
+        corner_edges: np.ndarray,
+        face_sizes: np.ndarray,
+    ) -> None:
+        self.co = co.reshape(-1, 3)
+        self.edges = edges.reshape(-1, 2)
+        self.corner_verts = corner_verts
+        self.corner_edges = corner_edges
+        self.face_sizes = face_sizes
+        self.memo: dict[int, bool] = {}
+
+        digest = 0
+        for x in (self.co, self.edges, corner_verts, corner_edges, face_sizes):
+            digest = zlib.crc32(np.ascontiguousarray(x), digest)
+        self.key = len(self.co), len(self.edges), len(face_sizes), digest
+
+    @property
+    def is_released(self) -> bool:
+        return self.co is None
+
+    def release(self) -> None:
+        self.co = self.edges = self.corner_verts = self.corner_edges = self.face_sizes = None
+
+
+class MeshRecord:
+    __slots__ = "uid", "name", "vertices", "geometry"
+
+    def __init__(self, uid: int, name: str, vertices: int, geometry: MeshGeometry | None = None) -> None:
+        self.uid = uid
+        self.name = name
+        self.vertices = vertices
+        self.geometry = geometry  # Only read when geometry checks are enabled
+
+    @property
+    def key(self) -> Hashable:
+        return self.uid, self.vertices, self.geometry.key if self.geometry is not None else None
+
+
+class SplineRecord:
+    __slots__ = "type", "points", "order_u"
+
+    def __init__(self, type: str, points: int, order_u: int) -> None:
+        self.type = type
+        self.points = points  # NURBS and poly points, zero for Bezier splines
+        self.order_u = order_u
+
+    @property
+    def key(self) -> Hashable:
+        return self.type, self.points, self.order_u
+
+
+class CurveRecord:
+    __slots__ = "uid", "name", "splines", "use_radius", "resolution_u", "bevel", "radius"
+
+    def __init__(
+        self,
+        uid: int,
+        name: str,
+        splines: tuple[SplineRecord, ...],
+        use_radius: bool,
+        resolution_u: int,
+        bevel: bool,
+        radius: np.ndarray | None = None,
+    ) -> None:
+        self.uid = uid
+        self.name = name
+        self.splines = splines
+        self.use_radius = use_radius
+        self.resolution_u = resolution_u
+        self.bevel = bevel
+        self.radius = radius  # Point radii of the first spline, only read when radius is used
+
+    @property
+    def key(self) -> Hashable:
+        return (
+            self.uid,
+            tuple(x.key for x in self.splines),
+            self.use_radius,
+            self.resolution_u,
+            self.bevel,
+            self.radius.tobytes() if self.radius is not None else None,
+        )
+
+
+DataRecord = MeshRecord | CurveRecord
+
+
+class ObjectRecord:
+    __slots__ = "uid", "name", "type", "scale", "data", "modifiers", "curves", "deps", "ignored", "gem"
+
+    def __init__(
+        self,
+        uid: int,
+        name: str,
+        type: str,
+        scale: tuple[float, float, float] = (1.0, 1.0, 1.0),
+        data: DataRecord | None = None,
+        modifiers: tuple[ModifierRecord, ...] = (),
+        curves: frozenset[int] = frozenset(),
+        deps: tuple[frozenset[int], frozenset[int]] = (frozenset(), frozenset()),
+        ignored: int = 0,
+        gem: bool = False,
+    ) -> None:
+        self.uid = uid
+        self.name = name
+        self.type = type
+        self.scale = scale
+        self.data = data
+        self.modifiers = modifiers
+        self.curves = curves  # Curve objects deforming this object
+        self.deps = deps  # Dependency graph edges of transform and geometry nodes
+        self.ignored = ignored  # Problem mask
+        self.gem = gem
+
+
+class Snapshot:
+    __slots__ = "collections", "objects"
+
+    def __init__(self, collections: list[CollectionRecord], objects: list[ObjectRecord]) -> None:
+        self.collections = collections
+        self.objects = objects
+
+
+# Extraction
+# ----------------------------
+
+
+def _uid(id_data: Any) -> int | None:
+    return id_data.session_uid if id_data is not None else None
+
+
+def _add_dep(deps: set[int], ob: Any, kind: int) -> None:
+    if ob is not None:
+        uid = ob.session_uid << 1
+        deps.add(uid | TRANSFORM)
+        if kind is GEOMETRY:
+            deps.add(uid | GEOMETRY)
+
+
+def read_uids(ids: Any) -> np.ndarray:
+    """Read session UID of all IDs in a single call"""
+    uids = np.empty(len(ids), dtype=np.int32)
+    ids.foreach_get("session_uid", uids)
+    return uids
+
+
+def extract_exclusions(coll: Any) -> tuple[frozenset[int], frozenset[int]]:
+    """Return UIDs of objects and collections in collection and its children"""
+    if coll is None:
+        return frozenset(), frozenset()
+
+    obs = frozenset(read_uids(coll.all_objects).tolist())
+    colls = frozenset((coll.session_uid, *(x.session_uid for x in coll.children_recursive)))
+    return obs, colls
+
+
+def extract_collections(layer_collection: Any, excluded: frozenset[int] = frozenset()) -> list[CollectionRecord]:
+    """Flatten layer collection tree in depth-first order, root and excluded subtrees are skipped"""
+    records = []
+    stack = [(x, None) for x in reversed(layer_collection.children)]
+
+    while stack:
+        coll, parent = stack.pop()
+        uid = coll.collection.session_uid
+
+        if uid in excluded:
+            continue
+
+        records.append(CollectionRecord(coll.name, uid, parent))
+
+        if coll.children:
+            stack.extend((x, uid) for x in reversed(coll.children))
+
+    return records
+
+
+def read_scales(obs: Any) -> np.ndarray:
+    """Read scale of all objects in a single call"""
+    scale = np.empty((len(obs), 3), dtype=np.float32)
+    obs.foreach_get("scale", scale.ravel())
+    return scale
+
+
+def _read(collection: Any, attr: str, dtype: type, size: int = 1) -> np.ndarray:
+    array = np.empty(len(collection) * size, dtype=dtype)
+    collection.foreach_get(attr, array)
+    return array
+
+
+def extract_geometry(me: Any) -> MeshGeometry:
+    return MeshGeometry(
+        _read(me.vertices, "co", np.float32, 3),
+        _read(me.edges, "vertices", np.int32, 2),
+        _read(me.loops, "vertex_index", np.int32),
+        _read(me.loops, "edge_index", np.int32),
+        _read(me.polygons, "loop_total", np.int32),
+    )
+
+
+def extract_mesh(me: Any, geometry: bool = False) -> MeshRecord:
+    return MeshRecord(me.session_uid, me.name, len(me.vertices), extract_geometry(me) if geometry else None)
+
+
+def extract_curve(cu: Any) -> CurveRecord:
+    splines = tuple(SplineRecord(x.type, len(x.points), x.order_u) for x in cu.splines)
+    radius = None
+
+    if cu.use_radius and splines:
+        spline = cu.splines[0]
+        points = spline.bezier_points or spline.points
+        radius = np.empty(len(points), dtype=np.float32)
+        points.foreach_get("radius", radius)
+
+    return CurveRecord(
+        cu.session_uid,
+        cu.name,
+        splines,
+        cu.use_radius,
+        cu.resolution_u,
+        bool(cu.bevel_depth or cu.extrude or cu.bevel_object is not None),
+        radius,
+    )
+
+
+def extract_data(ob: Any, geometry: bool = False) -> DataRecord | None:
+    if ob.data is None:
+        return None
+    if ob.type == "MESH":
+        return extract_mesh(ob.data, geometry)
+    if ob.type in {"CURVE", "FONT"}:
+        return extract_curve(ob.data)
+    return None
+
+
+def extract_modifier(mod: Any) -> ModifierRecord:
+    if mod.type == "BOOLEAN":
+        return ModifierRecord(mod.type, mod.operation, _uid(mod.object))
+    if mod.type == "NODES":
+        return ModifierRecord(mod.type, booltron=mod.node_group is not None and "booltron" in mod.node_group)
+    if mod.type in {"CURVE", "LATTICE"}:
+        return ModifierRecord(mod.type, object=_uid(mod.object))
+    if mod.type == "SHRINKWRAP":
+        return ModifierRecord(mod.type, object=_uid(mod.target))
+    return ModifierRecord(mod.type)
+
+
+def _refs(ob: Any) -> tuple[frozenset[int], tuple[frozenset[int], frozenset[int]]]:
+    """Return curve deformers and dependency graph edges of transform and geometry nodes"""
+    curves = set()
+    deps_transform = set()
+    deps_geometry = set()
+
+    for mod in ob.modifiers:
+        if mod.type == "CURVE" and mod.object:
+            curves.add(mod.object.session_uid)
+        for prop, kind in _MOD_TARGETS.get(mod.type, ()):
+            _add_dep(deps_geometry, getattr(mod, prop), kind)
+
+    for con in ob.constraints:
+        kind = GEOMETRY if con.type in _CON_GEOMETRY else TRANSFORM
+        if con.type == "ARMATURE":
+            for target in con.targets:
+                _add_dep(deps_transform, target.target, kind)
+        else:
+            _add_dep(deps_transform, getattr(con, "target", None), kind)
+
+    if ob.parent is not None:
+        kind = GEOMETRY if ob.parent_type in {"VERTEX", "VERTEX_3"} else TRANSFORM
+        _add_dep(deps_transform, ob.parent, kind)
+
+    return frozenset(curves), (frozenset(deps_transform), frozenset(deps_geometry))
+
+
+def read_ignored(ob: Any) -> int:
+    """Return mask of ignored problems, legacy list of codes is read when there is no mask"""
+    if (mask := ob.get(IGNORE_PROP)) is not None:
+        return mask
+    if (codes := ob.get(IGNORE_PROP_LEGACY)) is not None:
+        return problemlib.to_mask(codes)
+    return 0
+
+
+def write_ignored(ob: Any, keep: int, add: int) -> bool:
+    """Update mask of ignored problems, legacy list is replaced with mask, return True if object changed"""
+    old = read_ignored(ob)
+    new = old & keep | add
+    is_legacy = IGNORE_PROP_LEGACY in ob
+
+    if new == old and not is_legacy:
+        return False
+
+    if new:
+        ob[IGNORE_PROP] = new
+    elif IGNORE_PROP in ob:
+        del ob[IGNORE_PROP]
+
+    if is_legacy:
+        del ob[IGNORE_PROP_LEGACY]
+
+    return True
+
+
+def extract_object(
+    ob: Any,
+    scale: Iterable[float] | None = None,
+    data_record: DataRecord | None = None,
+) -> ObjectRecord:
+    """Extract object, scale and data record can be passed in when read in bulk or shared between users"""
+    curves, deps = _refs(ob)
+
+    if data_record is None:
+        data_record = extract_data(ob)
+
+    return ObjectRecord(
+        ob.session_uid,
+        ob.name,
+        ob.type,
+        tuple(scale if scale is not None else ob.scale),
+        data_record,
+        tuple(extract_modifier(mod) for mod in ob.modifiers),
+        curves,
+        deps,
+        read_ignored(ob),
+        "gem" in ob or (ob.parent is not None and "gem" in ob.parent),
+    )
+
+
+def extract(scene: Any, view_layer: Any, geometry: bool = False) -> Snapshot:
+    obs = scene.objects
+    scale = read_scales(obs).tolist()
+    excluded_obs, excluded_colls = extract_exclusions(scene.sidekick.exceptions)
+    datas = {}
+    records = []
+
+    for ob, sc in zip(obs, scale):
+        if ob.session_uid in excluded_obs:
+            continue
+
+        uid = _uid(ob.data)
+        if (rec := datas.get(uid)) is None and uid is not None:
+            rec = datas[uid] = extract_data(ob, geometry)
+        records.append(extract_object(ob, sc, rec))
+
+    return Snapshot(extract_collections(view_layer.layer_collection, excluded_colls), records)
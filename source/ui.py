@@ -62,9 +62,11 @@ class VIEW3D_PT_sidekick_problems(Panel):
                     emboss=False,
                 ).code = problem.code
 
+                row2 = row.row()
+                row2.alignment = "RIGHT"
+                row2.label(text=str(var.Report.counts.get(problem.code, 0)), translate=False)
+
                 if problem.select:
-                    row2 = row.row()
-                    row2.alignment = "RIGHT"
                     row2.operator("object.sidekick_select", text="", icon="RESTRICT_SELECT_OFF", emboss=False).code = problem.code
         else:
             box = layout.box()
@@ -90,13 +92,45 @@ class VIEW3D_PT_sidekick_problems(Panel):
                     emboss=False,
                 ).code = problem.code
 
+                row2 = row.row()
+                row2.alignment = "RIGHT"
+                row2.label(text=str(var.Report.counts_ignored.get(problem.code, 0)), translate=False)
+
                 if problem.select:
-                    row2 = row.row()
-                    row2.alignment = "RIGHT"
                     op = row2.operator("object.sidekick_select", text="", icon="RESTRICT_SELECT_OFF", emboss=False)
                     op.code = problem.code
                     op.use_ignored = True
 
+        layout.separator()
+        layout.prop(context.scene.sidekick, "exceptions", text="", icon="OUTLINER_COLLECTION")
+        layout.operator("wm.sidekick_scan_file", icon="SCENE_DATA")
+        layout.operator("wm.sidekick_report_export", icon="EXPORT")
+
+        for group in var.Report.file:
+            if group.summary.problems:
+                _file_group_ui(layout, group)
+
+
+def _file_group_ui(layout: UILayout, group) -> None:
+    col = layout.box().column()
+    col.label(text=f"{group.scene} / {group.view_layer}", icon="RENDERLAYERS", translate=False)
+
+    for problem in group.summary.problems:
+        row = col.row()
+
+        row1 = row.row()
+        row1.alignment = "LEFT"
+        row1.operator(
+            "wm.sidekick_show_description",
+            text=problem.title,
+            icon="CANCEL" if problem.type is problemlib.TYPE_ERROR else "ERROR",
+            emboss=False,
+        ).code = problem.code
+
+        row2 = row.row()
+        row2.alignment = "RIGHT"
+        row2.label(text=str(group.summary.counts.get(problem.code, 0)), translate=False)
+
 
 # Preferences
 # ---------------------------
@@ -137,3 +171,83 @@ def prefs_ui(self, context):
                 col = main.column(heading="Scene")
 
             col.prop(self, f"problem_{code}")
+
+    if _prop_panel(main, wm_props, "prefs_show_performance"):
+        main.prop(self, "scan_duty")
+        main.prop(self, "scan_budget")
+        main.prop(self, "scan_threads")
+        main.prop(self, "cache_size")
+        main.prop(self, "use_persist")
+
+        schedule = var.Schedule
+        cache = var.Report.cache
+        col = main.column(align=True)
+        col.active = False
+        row = col.row()
+        row.label(text="Refresh Interval")
+        row.label(text="Paused" if schedule.paused else f"{schedule.interval:.1f} s", translate=schedule.paused)
+        row = col.row()
+        row.label(text="Last Scan")
+        row.label(text=f"{schedule.duration * 1000:.1f} ms", translate=False)
+        row = col.row()
+        row.label(text="Duty Cycle")
+        row.label(text=f"{schedule.duty:.1%}", translate=False)
+        row = col.row()
+        row.label(text="Cached Objects")
+        row.label(text=f"{len(cache)} / {cache.maxsize}", translate=False)
+        row = col.row()
+        row.label(text="Hits / Misses")
+        row.label(text=f"{cache.hits} / {cache.misses}", translate=False)
+
+        if _prop_panel(main, wm_props, "prefs_show_stats"):
+            _stats_ui(main, self)
+
+
+def _stats_ui(layout: UILayout, prefs) -> None:
+    if var.Startup:
+        col = layout.box().column(align=True)
+        col.label(text="Startup")
+        for name, text in (
+            ("import", "Import"),
+            ("register", "Register"),
+            ("overlay", "Overlay"),
+            ("first_scan", "First Scan"),
+        ):
+            if name in var.Startup:
+                row = col.row()
+                row.label(text=text)
+                row.label(text=f"{var.Startup[name] * 1000:.2f} ms", translate=False)
+
+    layout.prop(prefs, "use_stats")
+
+    stats = var.Report.stats
+    if not (stats.checks or stats.passes):
+        return
+
+    col = layout.box().column(align=True)
+    row = col.row()
+    for text in ("", "Calls", "Reused", "Detected", "Total", "Max"):
+        row.label(text=text)
+
+    for code, counter in sorted(stats.checks.items()):
+        _stats_row(col, str(code), counter)
+
+    col.separator()
+
+    for name, counter in stats.passes.items():
+        _stats_row(col, name.title(), counter)
+
+    row = layout.row()
+    row.operator("wm.sidekick_stats_reset")
+    row.operator("wm.sidekick_stats_export")
+
+
+def _stats_row(layout: UILayout, name: str, counter) -> None:
+    row = layout.row()
+    row.active = counter.count != 0
+    row.label(text=name, translate=False)
+    row.label(text=str(counter.count), translate=False)
+    row.label(text=str(counter.reused), translate=False)
+    row.label(text=str(counter.hits), translate=False)
+    row.label(text=f"{counter.total * 1000:.2f} ms", translate=False)
+    row.label(text=f"{counter.max * 1000:.3f} ms", translate=False)
@@ -3,10 +3,14 @@
 
 from pathlib import Path
 
-from . import report
+from . import report, scheduler
 
 
 ADDON_ID = __package__
 ADDON_DIR = Path(__file__).parent
 
 Report = report.Scan()
+Schedule = scheduler.Scheduler()
+
+# Seconds spent on import, register, deferred overlay import and until first scan results
+Startup: dict[str, float] = {}
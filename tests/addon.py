@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Import add-on modules in Blender or plain CPython for tests that do not depend on bpy
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+
+def modules(*names: str) -> tuple[types.ModuleType, ...]:
+    try:
+        import addon_utils
+    except ImportError:
+        # Bare package, skips __init__ which depends on bpy
+        package = types.ModuleType("sidekick")
+        package.__path__ = [str(Path(__file__).parents[1] / "source")]
+        sys.modules["sidekick"] = package
+        return tuple(importlib.import_module(f"sidekick.{name}") for name in names)
+
+    for ext_id in addon_utils.modules().mapping:
+        if ext_id.split(".")[-1] == "sidekick":
+            addon_utils.enable(ext_id, default_set=True)
+            return tuple(importlib.import_module(f"{ext_id}.{name}") for name in names)
+
+    raise RuntimeError("Extension not found")
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Translation startup cost on generated catalogs, pickle of all locales against compiled catalog of active locale
+# Usage: python bench_localization.py [--entries 20000] [--locales 8]
+
+import argparse
+import pickle
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+REPEAT = 5
+
+
+(localization,) = addon.modules("localization")
+
+
+def _timeit(func: Callable, *args) -> tuple[float, Any]:
+    best = float("inf")
+
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+
+def _generate(directory: Path, entries: int, locales: int) -> list[str]:
+    rnd = random.Random(entries)
+    names = [f"l{i}_XX" for i in range(locales)]
+
+    for name in names:
+        lines = ['msgid ""', 'msgstr ""', '"Content-Type: text/plain; charset=UTF-8\\n"', ""]
+
+        for i in range(entries):
+            if rnd.random() < 0.2:
+                lines.append(f'msgctxt "Context {i % 7}"')
+            lines.append(f'msgid "Message {i} {"x" * rnd.randrange(40)}"')
+            if rnd.random() < 0.1:
+                lines += ['msgstr ""', f'"Перевод {i}\\n"', f'"строка {name}"']
+            else:
+                lines.append(f'msgstr "Перевод {i} {name}"')
+            lines.append("")
+
+        (directory / f"{name}.po").write_text("\n".join(lines), encoding="utf-8")
+
+    return names
+
+
+# Previous implementation, every locale parsed and pickled into single cache
+# ---------------------------
+
+
+def _pickle_init(directory: Path) -> dict:
+    path = directory / "__cache__.pickle"
+
+    if path.exists():
+        with open(path, "rb") as file:
+            return pickle.load(file)
+
+    dictionary = {
+        child.stem: localization._po_parse(child.read_text(encoding="utf-8"))
+        for child in directory.iterdir()
+        if child.suffix == ".po"
+    }
+
+    with open(path, "wb") as file:
+        pickle.dump(dictionary, file, pickle.HIGHEST_PROTOCOL)
+
+    return dictionary
+
+
+def _pickle_cold(directory: Path) -> dict:
+    (directory / "__cache__.pickle").unlink(missing_ok=True)
+    return _pickle_init(directory)
+
+
+# Compiled catalogs
+# ---------------------------
+
+
+def _catalog_cold(directory: Path, locale: str) -> dict:
+    for path in directory.glob(f"*{localization.SUFFIX}"):
+        path.unlink()
+    localization.clear()
+    return localization.load(locale, directory)
+
+
+def _catalog_warm(directory: Path, locale: str) -> dict:
+    localization.clear()
+    return localization.load(locale, directory)
+
+
+def _catalog_touched(directory: Path, locale: str) -> dict:
+    po = directory / f"{locale}.po"
+    po.touch()
+    localization.clear()
+    return localization.load(locale, directory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--locales", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        names = _generate(directory, args.entries, args.locales)
+        active = names[0]
+
+        print(f"{args.locales} locales x {args.entries} entries")
+
+        t_pickle_cold, dictionary = _timeit(_pickle_cold, directory)
+        t_pickle_warm, _ = _timeit(_pickle_init, directory)
+        t_cold, catalog = _timeit(_catalog_cold, directory, active)
+        t_warm, _ = _timeit(_catalog_warm, directory, active)
+        t_touched, _ = _timeit(_catalog_touched, directory, active)
+
+        assert catalog == dictionary[active], "Compiled catalog differs from parsed source"
+
+        print(f"{'':<26}{'pickle':>10}{'catalog':>10}")
+        print(f"{'First start':<26}{t_pickle_cold * 1000:>8.1f}ms{t_cold * 1000:>8.1f}ms")
+        print(f"{'Next start':<26}{t_pickle_warm * 1000:>8.1f}ms{t_warm * 1000:>8.1f}ms")
+        print(f"{'Source touched':<26}{'':>10}{t_touched * 1000:>8.1f}ms")
+        print(f"{'Speedup, next start':<26}{t_pickle_warm / t_warm:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Scan benchmark on generated scenes, compares results against JSON baseline
+# Usage: blender -b -P bench_scan.py -- [--update] [--quick] [--tolerance 0.25]
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+import traceback
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+BASELINE = Path(__file__).with_name("bench_scan.json")
+REPEAT = 3
+
+# Differences below these are noise regardless of tolerance
+FLOOR_TIME = 0.002
+FLOOR_MEMORY = 1 << 20
+
+
+var, checks, snapshot = addon.modules("var", "checks", "snapshot")
+
+
+# Scenes
+# ---------------------------
+
+
+def _clear() -> None:
+    bpy.data.batch_remove([x for x in bpy.data.scenes if x != bpy.context.scene])
+    bpy.data.batch_remove(bpy.data.objects)
+    bpy.data.batch_remove(bpy.data.collections)
+    bpy.data.batch_remove(bpy.data.meshes)
+    bpy.data.batch_remove(bpy.data.curves)
+
+
+def _mesh_objects(num: int, name: str = "Bench") -> list[bpy.types.Object]:
+    rnd = random.Random(num)
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)), (), ((0, 1, 2),))
+    coll = bpy.context.scene.collection
+    obs = []
+
+    for _ in range(num):
+        ob = bpy.data.objects.new(name, mesh)
+        if rnd.random() < 0.3:
+            ob.scale = (rnd.choice((0.5, 1.0 + 1e-4, 2.0)), 1.0, 1.0)
+        coll.objects.link(ob)
+        obs.append(ob)
+
+    return obs
+
+
+def scene_objects(num: int) -> None:
+    """Plain mesh objects sharing single mesh"""
+    _mesh_objects(num)
+
+
+def scene_collections(num: int) -> None:
+    """Collection tree, one deep branch with siblings on every level"""
+    total = max(1, num // 10)
+    depth = min(2048, total)
+    parent = bpy.context.scene.collection
+
+    for i in range(depth):
+        coll = bpy.data.collections.new(f"Level {i}")
+        parent.children.link(coll)
+        for j in range(total // depth - 1):
+            coll.children.link(bpy.data.collections.new(f"Collection {i}.{j}"))
+        parent = coll
+
+    for ob in _mesh_objects(num // 10):
+        parent.objects.link(ob)
+
+
+def scene_modifiers(num: int) -> None:
+    """Long modifier stacks"""
+    stack = ("BEVEL", "ARRAY", "MIRROR", "SOLIDIFY", "WELD", "TRIANGULATE", "BOOLEAN", "SMOOTH")
+
+    for ob in _mesh_objects(num // 32):
+        for i in range(31):
+            ob.modifiers.new("Modifier", stack[i % len(stack)])
+        ob.modifiers.new("Subdivision", "SUBSURF")
+
+
+def scene_curves(num: int) -> None:
+    """Dense curves deforming mesh objects"""
+    points = 10_000
+    obs = _mesh_objects(max(1, num // points))
+
+    for ob in obs:
+        curve = bpy.data.curves.new("Bench", "CURVE")
+        curve.use_radius = True
+        curve.resolution_u = 12
+        spline = curve.splines.new("NURBS")
+        spline.points.add(points - 1)
+        spline.order_u = 3
+        spline.points[-1].radius = 1.5
+
+        curve_ob = bpy.data.objects.new("Curve", curve)
+        bpy.context.scene.collection.objects.link(curve_ob)
+        ob.modifiers.new("Curve", "CURVE").object = curve_ob
+
+
+def scene_cycles(num: int) -> None:
+    """Shrinkwrap and Boolean pairs depending on each other"""
+    obs = _mesh_objects(num)
+
+    for a, b in zip(obs[::2], obs[1::2]):
+        a.modifiers.new("Shrinkwrap", "SHRINKWRAP").target = b
+        b.modifiers.new("Boolean", "BOOLEAN").object = a
+
+
+def scene_shared(num: int) -> None:
+    """Dozens of scenes with their own view layers linking one asset collection"""
+    assets = bpy.data.collections.new("Assets")
+    bpy.context.scene.collection.children.link(assets)
+
+    for ob in _mesh_objects(num):
+        bpy.context.scene.collection.objects.unlink(ob)
+        assets.objects.link(ob)
+
+    for i in range(24):
+        scene = bpy.data.scenes.new(f"Shot {i}")
+        scene.collection.children.link(assets)
+        scene.view_layers.new("Lighting")
+
+
+SCENES = (scene_objects, scene_collections, scene_modifiers, scene_curves, scene_cycles, scene_shared)
+
+
+# Measurements
+# ---------------------------
+
+
+def _best(func) -> float:
+    best = float("inf")
+
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def _scan_cold() -> None:
+    var.Report.cache.clear()
+    var.Report.get()
+
+
+def _scan_block() -> float:
+    """Longest main thread refresh of a time-sliced scan, object pass runs on worker threads"""
+    var.Report.cache.clear()
+    var.Report.tag_full()
+    longest = 0.0
+
+    while True:
+        start = time.perf_counter()
+        var.Report.update()
+        longest = max(longest, time.perf_counter() - start)
+
+        if var.Report.progress is None:
+            return longest
+
+        time.sleep(0.01)  # Refresh interval of a pending scan
+
+
+def _peak_memory() -> int:
+    var.Report.cache.clear()
+    tracemalloc.start()
+    var.Report.get()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def _check_times() -> dict[str, float]:
+    """Cumulative time of each check over all scene objects"""
+    snap = snapshot.extract(bpy.context.scene, bpy.context.view_layer)
+    state = checks.Detect()
+    state.inspect(snap)  # Resolve deformers and cyclic state
+
+    # Fresh instance, data check results of the inspection are shared per datablock
+    Check = checks.Detect()
+    Check.deformers = state.deformers
+    Check.cyclic = state.cyclic
+    scaled = checks.scaled_mask(np.array([x.scale for x in snap.objects], dtype=np.float32).reshape(-1, 3)).tolist()
+    times = {}
+
+    def time_checks(table: tuple, value) -> None:
+        for compiled in table:
+            start = time.perf_counter()
+            Check.run((compiled,), value)
+            key = str(compiled[0])
+            times[key] = times.get(key, 0.0) + time.perf_counter() - start
+
+    table, _ = Check.table("COLLECTION")
+    for coll in snap.collections:
+        time_checks(table, coll)
+
+    for ob, is_scaled in zip(snap.objects, scaled):
+        Check.uid = ob.uid
+        Check.is_scaled = is_scaled
+        for table in Check.table(ob.type, ob.ignored):
+            time_checks(table, ob)
+
+    return times
+
+
+def measure(scene, num: int) -> dict:
+    _clear()
+    scene(num)
+
+    return {
+        "objects": len(bpy.context.scene.objects),
+        "scan_cold": _best(_scan_cold),
+        "scan_warm": _best(var.Report.get),
+        "scan_file": _best(var.Report.get_file),
+        "scan_block": _scan_block(),
+        "checks": _check_times(),
+        "peak_memory": _peak_memory(),
+    }
+
+
+# Comparison
+# ---------------------------
+
+
+def _regressions(key: str, current: dict, baseline: dict, tolerance: float) -> list[str]:
+    found = []
+
+    def compare(name: str, value: float, base: float, floor: float) -> None:
+        if value > base * (1.0 + tolerance) and value - base > floor:
+            found.append(f"{key} {name}: {base:.4g} -> {value:.4g} (+{(value / base - 1.0) * 100:.0f}%)")
+
+    for name in ("scan_cold", "scan_warm", "scan_file", "scan_block"):
+        if name in baseline:
+            compare(name, current[name], baseline[name], FLOOR_TIME)
+
+    for code, value in current["checks"].items():
+        if code in baseline["checks"]:
+            compare(f"check {code}", value, baseline["checks"][code], FLOOR_TIME)
+
+    compare("peak_memory", current["peak_memory"], baseline["peak_memory"], FLOOR_MEMORY)
+
+    return found
+
+
+def main() -> None:
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="bench_scan.py")
+    parser.add_argument("--update", action="store_true", help="Write current results as baseline")
+    parser.add_argument("--quick", action="store_true", help="Only run smallest scene size")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    sizes = (1_000,) if args.quick else (1_000, 10_000, 100_000)
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8")) if BASELINE.exists() else {}
+    results = {}
+    regressions = []
+
+    print(f"{'':<20}{'size':>10}{'cold ms':>12}{'warm ms':>12}{'file ms':>12}{'block ms':>12}{'peak MB':>10}")
+
+    for scene in SCENES:
+        for num in sizes:
+            key = f"{scene.__name__.removeprefix('scene_')}_{num}"
+            result = results[key] = measure(scene, num)
+
+            print(
+                f"{key:<20}{result['objects']:>10}"
+                f"{result['scan_cold'] * 1000:>12.2f}{result['scan_warm'] * 1000:>12.2f}{result['scan_file'] * 1000:>12.2f}"
+                f"{result['scan_block'] * 1000:>12.2f}"
+                f"{result['peak_memory'] / (1 << 20):>10.1f}"
+            )
+
+            if key in baseline:
+                regressions += _regressions(key, result, baseline[key], args.tolerance)
+
+    _clear()
+
+    if args.update or not baseline:
+        BASELINE.write_text(json.dumps(baseline | results, indent=4), encoding="utf-8")
+        print(f"Baseline written to {BASELINE}")
+        return
+
+    if regressions:
+        raise Exception("Performance regression\n" + "\n".join(regressions))
+
+
+try:
+    main()
+except:
+    traceback.print_exc()
+    sys.exit(1)
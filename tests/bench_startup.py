@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Add-on startup time, enables extension from clean module state several times
+# Usage: blender -b -P bench_startup.py -- [--repeat 5]
+
+import argparse
+import importlib
+import sys
+import time
+import traceback
+from pathlib import Path
+
+import addon_utils
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+
+def _purge(ext_id: str) -> None:
+    for name in [x for x in sys.modules if x == ext_id or x.startswith(f"{ext_id}.")]:
+        del sys.modules[name]
+
+
+def _enable(ext_id: str) -> tuple[float, dict[str, float], bool]:
+    addon_utils.disable(ext_id, default_set=True)
+    _purge(ext_id)
+
+    start = time.perf_counter()
+    addon_utils.enable(ext_id, default_set=True)
+    duration = time.perf_counter() - start
+
+    var = importlib.import_module(f"{ext_id}.var")
+    return duration, dict(var.Startup), f"{ext_id}.overlay" in sys.modules
+
+
+def main() -> None:
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    ext_id = addon.modules("var")[0].__package__
+    results = [_enable(ext_id) for _ in range(args.repeat)]
+
+    for _, _, is_overlay_loaded in results:
+        assert not is_overlay_loaded, "Overlay module loaded before first draw"
+
+    def best(name: str) -> float:
+        return min(x[1].get(name, 0.0) for x in results) * 1000
+
+    print(f"{'Enable':<12}{min(x[0] for x in results) * 1000:>8.2f}ms")
+    print(f"{'Import':<12}{best('import'):>8.2f}ms")
+    print(f"{'Register':<12}{best('register'):>8.2f}ms")
+
+
+try:
+    main()
+except:
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Usage: blender -b -P bench_vectorized.py
+
+import random
+import sys
+import time
+import traceback
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import bpy
+from bpy.types import Curve, Mesh, SceneObjects
+from mathutils.kdtree import KDTree
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+SIZES = (1_000, 10_000, 100_000)
+REPEAT = 5
+
+
+def _timeit(func: Callable, *args) -> tuple[float, Any]:
+    best = float("inf")
+
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+
+def _populate(num: int) -> None:
+    bpy.data.batch_remove(bpy.data.objects)
+
+    rnd = random.Random(num)
+    mesh = bpy.data.meshes.new("Bench")
+    coll = bpy.context.scene.collection
+
+    for _ in range(num):
+        ob = bpy.data.objects.new("Bench", mesh)
+        if rnd.random() < 0.3:
+            ob.scale = (rnd.choice((0.5, 1.0 + 1e-4, 1.0 + 1e-7, 2.0)), 1.0, 1.0)
+        elif rnd.random() < 0.5:
+            # Near unit scales where float rounding of the sum decides the result
+            ob.scale = [1.0 + rnd.uniform(-5e-7, 5e-7) for _ in range(3)]
+        coll.objects.link(ob)
+
+
+def _add_curve(num: int) -> Curve:
+    curve = bpy.data.curves.new("Bench", "CURVE")
+    curve.use_radius = True
+
+    spline = curve.splines.new("NURBS")
+    spline.points.add(num - 1)
+    spline.points[-1].radius = 1.5
+
+    return curve
+
+
+def _add_grid(num: int) -> Mesh:
+    side = round(num ** 0.5)
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=side, y_subdivisions=side)
+    me = bpy.context.object.data
+    me.vertices[0].co = me.vertices[1].co
+    return me
+
+
+# Reference implementations
+# ---------------------------
+
+
+def _scaled_scalar(obs: SceneObjects) -> list[bool]:
+    return [abs(ob.scale.length_squared - 3.0) > 1e-6 for ob in obs]
+
+
+def _radius_scalar(curve: Curve) -> bool:
+    if curve.use_radius and curve.splines:
+        for p in (curve.splines[0].bezier_points or curve.splines[0].points):
+            if p.radius != 1.0:
+                return True
+
+    return False
+
+
+def _geometry_scalar(me: Mesh) -> list[bool]:
+    vert_users = [0] * len(me.vertices)
+    edge_users = [0] * len(me.edges)
+    zero_area = False
+
+    for v1, v2 in (e.vertices for e in me.edges):
+        vert_users[v1] += 1
+        vert_users[v2] += 1
+
+    for face in me.polygons:
+        if face.area < 1e-10:
+            zero_area = True
+        for i in face.loop_indices:
+            edge_users[me.loops[i].edge_index] += 1
+
+    kd = KDTree(len(me.vertices))
+    for v in me.vertices:
+        kd.insert(v.co, v.index)
+    kd.balance()
+    doubles = any(len(kd.find_range(v.co, 1e-5)) > 1 for v in me.vertices)
+
+    return [
+        zero_area,
+        0 in vert_users,
+        0 in edge_users,
+        doubles,
+        max(edge_users, default=0) > 2,
+    ]
+
+
+def _geometry_batched(checks: ModuleType, snapshot: ModuleType, me: Mesh) -> list[bool]:
+    geo = snapshot.extract_geometry(me)
+    return [
+        checks.has_zero_area(geo),
+        checks.has_loose_verts(geo),
+        checks.has_loose_edges(geo),
+        checks.has_doubles(geo),
+        checks.has_non_manifold(geo),
+    ]
+
+
+def main() -> None:
+    checks, snapshot = addon.modules("checks", "snapshot")
+
+    print(f"{'':<16}{'size':>10}{'scalar ms':>12}{'batched ms':>12}{'speedup':>10}")
+
+    for num in SIZES:
+        _populate(num)
+        obs = bpy.context.scene.objects
+
+        t_scalar, expected = _timeit(_scaled_scalar, obs)
+        t_batched, result = _timeit(lambda x: checks.scaled_mask(snapshot.read_scales(x)), obs)
+
+        if result.tolist() != expected:
+            raise Exception(f"Scaled object mismatch at {num} objects")
+
+        print(f"{'Scaled object':<16}{num:>10}{t_scalar * 1000:>12.2f}{t_batched * 1000:>12.2f}{t_scalar / t_batched:>9.1f}x")
+
+    for num in SIZES:
+        curve = _add_curve(num)
+
+        t_scalar, expected = _timeit(_radius_scalar, curve)
+        t_batched, result = _timeit(lambda x: checks.Detect._301(snapshot.extract_curve(x)), curve)
+
+        if result != expected:
+            raise Exception(f"Curve Radius mismatch at {num} points")
+
+        print(f"{'Curve Radius':<16}{num:>10}{t_scalar * 1000:>12.2f}{t_batched * 1000:>12.2f}{t_scalar / t_batched:>9.1f}x")
+
+    for num in (*SIZES, 1_000_000):
+        me = _add_grid(num)
+
+        t_scalar, expected = _timeit(_geometry_scalar, me)
+        t_batched, result = _timeit(_geometry_batched, checks, snapshot, me)
+
+        if result != expected:
+            raise Exception(f"Mesh geometry mismatch at {num} vertices", result, expected)
+
+        print(f"{'Mesh Geometry':<16}{num:>10}{t_scalar * 1000:>12.2f}{t_batched * 1000:>12.2f}{t_scalar / t_batched:>9.1f}x")
+
+
+try:
+    main()
+except:
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,302 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Detection engine on hand built snapshots, runs in Blender or plain CPython
+# Usage: blender -b -P test_checks.py
+#        python test_checks.py
+
+import pickle
+import sys
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+
+checks, snapshot = addon.modules("checks", "snapshot")
+Record = snapshot.ObjectRecord
+Mod = snapshot.ModifierRecord
+
+
+def _mesh(uid: int, vertices: int = 8) -> snapshot.MeshRecord:
+    return snapshot.MeshRecord(uid + 1000, "Mesh", vertices)
+
+
+def _curve(uid: int, radius: float = 1.0, order: int = 5, resolution: int = 64) -> snapshot.CurveRecord:
+    return snapshot.CurveRecord(
+        uid + 1000,
+        "Curve",
+        (snapshot.SplineRecord("NURBS", 4, order),),
+        True,
+        resolution,
+        False,
+        np.full(4, radius, dtype=np.float32),
+    )
+
+
+_CUBE_CO = [(x, y, z) for x in (-1.0, 1.0) for y in (-1.0, 1.0) for z in (-1.0, 1.0)]
+_CUBE_FACES = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+
+
+def _geometry(co: list, faces: list, loose_edges: tuple = ()) -> snapshot.MeshGeometry:
+    edges = {}
+    corner_verts = []
+    corner_edges = []
+
+    for face in faces:
+        for a, b in zip(face, face[1:] + face[:1]):
+            corner_verts.append(a)
+            corner_edges.append(edges.setdefault((min(a, b), max(a, b)), len(edges)))
+
+    for edge in loose_edges:
+        edges.setdefault(edge, len(edges))
+
+    return snapshot.MeshGeometry(
+        np.array(co, dtype=np.float32),
+        np.array(list(edges), dtype=np.int32),
+        np.array(corner_verts, dtype=np.int32),
+        np.array(corner_edges, dtype=np.int32),
+        np.array([len(x) for x in faces], dtype=np.int32),
+    )
+
+
+def _cube(uid: int, co: tuple = (), faces: tuple = (), loose_edges: tuple = ()) -> snapshot.MeshRecord:
+    geometry = _geometry(_CUBE_CO + list(co), _CUBE_FACES + list(faces), loose_edges)
+    return snapshot.MeshRecord(uid + 1000, "Mesh", len(geometry.co), geometry)
+
+
+def _dep(uid: int) -> frozenset[int]:
+    return frozenset({uid << 1 | snapshot.TRANSFORM, uid << 1 | snapshot.GEOMETRY})
+
+
+def test_101() -> list[Record]:
+    """Scaled object"""
+    return [
+        Record(1, "Scaled", "MESH", (1.5, 1.0, 1.0), _mesh(1)),
+        Record(2, "Gem", "MESH", (1.5, 1.0, 1.0), _mesh(2), gem=True),
+        Record(3, "Unit", "MESH", (1.0, 1.0, 1.0000001), _mesh(3)),
+    ]
+
+
+def test_102() -> list[Record]:
+    """Empty object"""
+    return [
+        Record(1, "Empty", "MESH", data=_mesh(1, 0)),
+        Record(2, "Nodes", "MESH", data=_mesh(2, 0), modifiers=(Mod("NODES"),)),
+    ]
+
+
+def test_201() -> list[Record]:
+    """Modifier order is incorrect"""
+    return [
+        Record(1, "Order", "MESH", data=_mesh(1), modifiers=(Mod("CURVE"), Mod("SUBSURF"))),
+        Record(2, "Plain", "MESH", data=_mesh(2), modifiers=(Mod("NODES"), Mod("SUBSURF"))),
+    ]
+
+
+def test_202() -> list[Record]:
+    """Cyclic dependency"""
+    return [
+        Record(1, "A", "MESH", data=_mesh(1), deps=(frozenset(), _dep(2))),
+        Record(2, "B", "MESH", data=_mesh(2), deps=(frozenset(), _dep(1))),
+        Record(3, "Cutter", "MESH", data=_mesh(3), deps=(frozenset({4 << 1}), frozenset())),
+        Record(4, "Parent", "MESH", data=_mesh(4), deps=(frozenset(), _dep(3))),
+    ]
+
+
+def test_301() -> list[Record]:
+    """Curve Radius deformation"""
+    return [
+        Record(1, "Curve", "CURVE", data=_curve(1, radius=1.5)),
+        Record(2, "Idle", "CURVE", data=_curve(2, radius=1.5)),
+        Record(3, "User", "MESH", data=_mesh(3), curves=frozenset({1})),
+    ]
+
+
+def test_302() -> list[Record]:
+    """Curve low Order"""
+    return [Record(1, "Curve", "CURVE", data=_curve(1, order=3))]
+
+
+def test_303() -> list[Record]:
+    """Curve low Resolution"""
+    return [
+        Record(1, "Curve", "CURVE", data=_curve(1, resolution=12)),
+        Record(2, "User", "MESH", data=_mesh(2), curves=frozenset({1})),
+    ]
+
+
+def test_304() -> list[Record]:
+    """Zero area faces"""
+    return [
+        Record(1, "Collapsed", "MESH", data=_cube(1, ((2.0, -1.0, -1.0),), ((0, 4, 8),))),
+        Record(2, "Cube", "MESH", data=_cube(2)),
+    ]
+
+
+def test_305() -> list[Record]:
+    """Loose vertices"""
+    return [
+        Record(1, "Loose", "MESH", data=_cube(1, ((3.0, 0.0, 0.0),))),
+        Record(2, "Cube", "MESH", data=_cube(2)),
+    ]
+
+
+def test_306() -> list[Record]:
+    """Loose edges"""
+    return [
+        Record(1, "Loose", "MESH", data=_cube(1, ((3.0, 0.0, 0.0),), loose_edges=((0, 8),))),
+        Record(2, "Cube", "MESH", data=_cube(2)),
+    ]
+
+
+def test_307() -> list[Record]:
+    """Coincident vertices"""
+    return [
+        Record(1, "Doubles", "MESH", data=_cube(1, ((-1.0, -1.0, -1.000001), (0.0, 0.0, -3.0)), ((8, 1, 9),))),
+        Record(2, "Cube", "MESH", data=_cube(2)),
+        # Pair on both sides of merge distance grid cell boundary
+        Record(3, "Straddle", "MESH", data=_cube(3, ((0.5e-5 - 1e-7, 0.0, -3.0), (0.5e-5 + 1e-7, 0.0, -3.0)), ((8, 9, 0),))),
+    ]
+
+
+def test_308() -> list[Record]:
+    """Non-manifold edges"""
+    mesh = _cube(1, ((0.0, -3.0, 0.0),), ((0, 1, 8),))
+    return [
+        Record(1, "Fin", "MESH", data=mesh),
+        Record(2, "Instance", "MESH", data=mesh),
+        Record(3, "Cube", "MESH", data=_cube(3)),
+    ]
+
+
+def test_401() -> list[Record]:
+    """Collection uses default name"""
+    return []
+
+
+EXPECTED = {
+    101: {"Scaled"},
+    102: {"Empty"},
+    201: {"Order"},
+    202: {"A", "B"},
+    301: {"Curve"},
+    302: {"Curve"},
+    303: {"Curve"},
+    304: {"Collapsed"},
+    305: {"Loose"},
+    306: {"Loose"},
+    307: {"Doubles", "Straddle"},
+    308: {"Fin", "Instance"},
+    401: set(),
+}
+
+
+def _ignore(props: dict, codes: set[int], mode: str) -> bool:
+    return snapshot.write_ignored(props, *checks.problemlib.mode_masks(checks.problemlib.to_mask(codes), mode))
+
+
+def _test_ignore() -> None:
+    to_mask = checks.problemlib.to_mask
+
+    # Legacy list of codes is read, mask takes precedence over it
+    if snapshot.read_ignored({snapshot.IGNORE_PROP_LEGACY: [101, 307]}) != to_mask({101, 307}):
+        raise Exception("ignore", "legacy")
+    if snapshot.read_ignored({snapshot.IGNORE_PROP: to_mask({102}), snapshot.IGNORE_PROP_LEGACY: [101]}) != to_mask({102}):
+        raise Exception("ignore", "precedence")
+    if snapshot.read_ignored({}) != 0:
+        raise Exception("ignore", "empty")
+
+    # Legacy list is converted to mask on write
+    props = {snapshot.IGNORE_PROP_LEGACY: [101]}
+    if not _ignore(props, {307}, "ADD") or props != {snapshot.IGNORE_PROP: to_mask({101, 307})}:
+        raise Exception("ignore", "convert", props)
+
+    # Replace, add and remove, unchanged objects are reported as such
+    props = {}
+    for codes, mode, expected, is_changed in (
+        ({101, 102}, "SET", {101, 102}, True),
+        ({101, 102}, "SET", {101, 102}, False),
+        ({307}, "ADD", {101, 102, 307}, True),
+        ({102, 308}, "REMOVE", {101, 307}, True),
+        ({308}, "REMOVE", {101, 307}, False),
+        ({401}, "SET", {401}, True),
+    ):
+        if _ignore(props, codes, mode) is not is_changed or snapshot.read_ignored(props) != to_mask(expected):
+            raise Exception("ignore", mode, codes, props)
+
+    # Empty mask removes the property
+    if not _ignore(props, {401}, "REMOVE") or props:
+        raise Exception("ignore", "remove", props)
+    if not _ignore({snapshot.IGNORE_PROP_LEGACY: [101]}, set(), "SET"):
+        raise Exception("ignore", "legacy", "clear")
+
+
+def main() -> None:
+    for name, func in globals().items():
+        if not name.startswith("test"):
+            continue
+
+        code = int(name.split("_")[1])
+        snap = snapshot.Snapshot(
+            [snapshot.CollectionRecord("Collection"), snapshot.CollectionRecord("Props")],
+            func(),
+        )
+        snap = pickle.loads(pickle.dumps(snap))
+
+        coll_found, found = checks.Detect().inspect(snap)
+        names = {x.uid: x.name for x in snap.objects}
+        flagged = {names[uid] for uid, codes in found.items() if code in codes}
+
+        if flagged != EXPECTED[code]:
+            raise Exception(code, flagged)
+        if (code in coll_found) is not (code == 401):
+            raise Exception(code, coll_found)
+
+        # Ignored and disabled problems are skipped
+        for ob in snap.objects:
+            ob.ignored = checks.problemlib.bits[code]
+        if any(code in codes for codes in checks.Detect().inspect(snap)[1].values()):
+            raise Exception(code, "ignored")
+        if code in checks.Detect({code}).inspect(snap)[0]:
+            raise Exception(code, "disabled")
+
+    # Data checks run once per datablock and results are shared between users
+    stats = checks.Stats()
+    checks.Detect(stats=stats).inspect(snapshot.Snapshot([], test_308()))
+    counter = stats.checks[308]
+    if (counter.count, counter.reused, counter.hits) != (2, 1, 1):
+        raise Exception(308, "shared", counter.as_dict())
+
+    # Instances forked for worker threads share data check results
+    stats.clear()
+    Check = checks.Detect(stats=stats)
+    records = test_308()
+    Check.inspect(snapshot.Snapshot([], records))
+    Check.fork().inspect(snapshot.Snapshot([], records))
+    if (counter.count, counter.reused) != (2, 4):
+        raise Exception(308, "fork", counter.as_dict())
+
+    _test_ignore()
+
+    # Geometry arrays are released after enabled checks are memoized
+    records = test_307()
+    for record in records:
+        if not checks.Detect({305}).analyze(record.data) or not record.data.geometry.is_released:
+            raise Exception(307, "released")
+    if checks.Detect().analyze(records[0].data):
+        raise Exception(307, "missing")
+
+    found = checks.Detect({305}).inspect(snapshot.Snapshot([], records))[1]
+    if {x.name for x in records if 307 in found.get(x.uid, ())} != EXPECTED[307]:
+        raise Exception(307, "memo", found)
+
+
+try:
+    main()
+except:
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Report export writers, runs in Blender or plain CPython
+# Usage: blender -b -P test_export.py
+#        python test_export.py
+
+import io
+import json
+import sys
+import traceback
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+
+export, problemlib = addon.modules("export", "problemlib")
+Finding = export.Finding
+
+FINDINGS = [
+    Finding(problemlib.ID_OB_SCALE, False, "Cube", "Cube.001"),
+    Finding(problemlib.ID_MESH_DOUBLES, True, "Cube", "Cube.001"),
+    Finding(problemlib.ID_OB_EMPTY, False, "Empty"),
+    Finding(problemlib.ID_COLLECTION_NAME, False, collection="Collection"),
+]
+
+INFO = {
+    "tool": "Sidekick",
+    "version": export.addon_version(),
+    "file": "/tmp/scene.blend",
+    "uri": "file:///tmp/scene.blend",
+    "scene": "Scene",
+    "view_layer": "ViewLayer",
+    "errors": 1,
+    "warnings": 2,
+    "timing": {"scan": 0.25, "update": 0.001},
+}
+
+
+def _write(writer, findings) -> tuple[int, dict]:
+    file = io.StringIO()
+    count = writer(file, iter(findings), INFO)
+    return count, json.loads(file.getvalue())
+
+
+def test_json() -> None:
+    count, doc = _write(export.write_json, FINDINGS)
+
+    if count != len(FINDINGS) or len(doc["findings"]) != count:
+        raise Exception("json", count)
+    if {k: doc[k] for k in INFO} != INFO:
+        raise Exception("json", "info")
+
+    item = doc["findings"][2]
+    expected = {
+        "code": problemlib.ID_OB_EMPTY,
+        "severity": "warning",
+        "title": problemlib.coll[problemlib.ID_OB_EMPTY].title,
+        "object": "Empty",
+        "datablock": None,
+        "collection": None,
+        "ignored": False,
+    }
+    if item != expected:
+        raise Exception("json", item)
+
+    if _write(export.write_json, [])[1]["findings"] != []:
+        raise Exception("json", "empty")
+
+
+def test_sarif() -> None:
+    count, doc = _write(export.write_sarif, FINDINGS)
+    run = doc["runs"][0]
+    rules = run["tool"]["driver"]["rules"]
+    results = run["results"]
+
+    if doc["version"] != "2.1.0" or not count == len(results) == len(FINDINGS):
+        raise Exception("sarif", count)
+    if [x["id"] for x in rules] != [str(x) for x in problemlib.coll]:
+        raise Exception("sarif", "rules")
+    if run["properties"]["timing"] != INFO["timing"]:
+        raise Exception("sarif", "timing")
+
+    for finding, result in zip(FINDINGS, results):
+        if not rules[result["ruleIndex"]]["id"] == result["ruleId"] == str(finding.code):
+            raise Exception("sarif", result)
+        if ("suppressions" in result) is not finding.ignored:
+            raise Exception("sarif", "ignored", result)
+
+    if results[0]["level"] != "error" or results[0]["properties"]["datablock"] != "Cube.001":
+        raise Exception("sarif", results[0])
+    if results[1]["suppressions"] != [{"kind": "inSource"}]:
+        raise Exception("sarif", results[1])
+    if results[3]["locations"][0]["logicalLocations"][0] != {"name": "Collection", "kind": "collection"}:
+        raise Exception("sarif", results[3])
+
+
+def main() -> None:
+    for name, func in globals().items():
+        if name.startswith("test"):
+            func()
+
+
+try:
+    main()
+except:
+    traceback.print_exc()
+    sys.exit(1)
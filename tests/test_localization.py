@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Compiled translation catalogs, runs in Blender or plain CPython
+# Usage: blender -b -P test_localization.py
+#        python test_localization.py
+
+import os
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+
+(localization,) = addon.modules("localization")
+
+PO = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+msgctxt "Operator"
+msgid "Scan"
+msgstr "Сканировать"
+
+msgid "Problems"
+msgstr "Проблемы"
+"""
+
+
+def _touch(po: Path) -> int:
+    stat = po.stat()
+    mtime = stat.st_mtime_ns + 1_000_000_000
+    os.utime(po, ns=(stat.st_atime_ns, mtime))
+    return mtime
+
+
+def test_missing() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        localization.clear()
+        if localization.load("xx_XX", Path(tmp)) is not None:
+            raise Exception("missing")
+
+
+def test_touched() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        po = directory / "ru_RU.po"
+        po.write_text(PO, encoding="utf-8")
+        path = po.with_suffix(localization.SUFFIX)
+
+        localization.clear()
+        expected = localization.load("ru_RU", directory)
+        if expected != {("Operator", "Scan"): "Сканировать", ("*", "Problems"): "Проблемы"}:
+            raise Exception("touched", "build", expected)
+
+        data = path.read_bytes()
+        if localization._validate(data, po) is not data:
+            raise Exception("touched", "unchanged")
+
+        # Content hash matches, only header is refreshed
+        mtime = _touch(po)
+        refreshed = localization._validate(data, po)
+        if refreshed is None or refreshed[localization._HEADER.size:] != data[localization._HEADER.size:]:
+            raise Exception("touched", "hash")
+        if localization._HEADER.unpack_from(refreshed)[2] != mtime:
+            raise Exception("touched", "mtime")
+
+        localization.clear()
+        if localization.load("ru_RU", directory) != expected or path.read_bytes() != refreshed:
+            raise Exception("touched", "load")
+
+
+def test_edited() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        po = directory / "ru_RU.po"
+        po.write_text(PO, encoding="utf-8")
+        path = po.with_suffix(localization.SUFFIX)
+
+        localization.clear()
+        localization.load("ru_RU", directory)
+        data = path.read_bytes()
+
+        # Same size, hash decides
+        po.write_text(PO.replace("Проблемы", "Проблема"), encoding="utf-8")
+        _touch(po)
+        if localization._validate(data, po) is not None:
+            raise Exception("edited", "validate")
+
+        localization.clear()
+        if localization.load("ru_RU", directory)[("*", "Problems")] != "Проблема":
+            raise Exception("edited", "rebuild")
+        if localization._validate(path.read_bytes(), po) is None:
+            raise Exception("edited", "write")
+
+
+def main() -> None:
+    for name, func in globals().items():
+        if name.startswith("test"):
+            func()
+
+
+try:
+    main()
+except:
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Scan results stored in .blend file, runs in Blender or plain CPython
+# Usage: blender -b -P test_persist.py
+#        python test_persist.py
+
+import sys
+import traceback
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+
+persist, problemlib = addon.modules("persist", "problemlib")
+Entry = persist.Entry
+
+TAG = persist.tag("1.0.0", ())
+OBJECTS = {
+    "Cube": Entry(persist.fingerprint(("MESH", (2.0, 1.0, 1.0))), problemlib.to_mask({101, 307}), 0),
+    "Куб": Entry(persist.fingerprint(("MESH", (1.0, 1.0, 1.0))), 0, problemlib.to_mask({101})),
+    "Empty": Entry(persist.fingerprint(("MESH", None)), 0, 0),
+}
+COLL_FOUND = {problemlib.ID_COLLECTION_NAME: 3}
+
+
+def test_roundtrip() -> None:
+    data = persist.encode(TAG, "ViewLayer", OBJECTS.items(), COLL_FOUND)
+    payload = persist.decode(data, TAG)
+
+    if payload != persist.Payload("ViewLayer", OBJECTS, COLL_FOUND):
+        raise Exception("roundtrip", payload)
+
+
+def test_compatibility() -> None:
+    data = persist.encode(TAG, "ViewLayer", OBJECTS.items(), COLL_FOUND)
+
+    for tag in (persist.tag("1.0.1", ()), persist.tag("1.0.0", (101,))):
+        if persist.decode(data, tag) is not None:
+            raise Exception("tag")
+
+    for damaged in (data[:10], data[:-8], b"", b"SKRS" + data[4:20]):
+        if persist.decode(damaged, TAG) is not None:
+            raise Exception("damaged", damaged[:8])
+
+
+def test_size_limit() -> None:
+    entry = Entry(persist.fingerprint(()), 0, 0)
+    num = persist.MAX_SIZE // 24
+    data = persist.encode(TAG, "ViewLayer", ((f"Object.{i:06}", entry) for i in range(num)), {})
+    stored = len(persist.decode(data, TAG).objects)
+
+    if not 0 < stored < num:
+        raise Exception("size", stored)
+
+
+def test_mask() -> None:
+    # Bits are stored in files, existing ones must never move
+    if problemlib.bits[101] != 1 or problemlib.bits[401] != 1 << 7:
+        raise Exception("mask", "bits")
+    if set(problemlib.bits) != set(problemlib.coll) or len(set(problemlib.bits.values())) != len(problemlib.bits):
+        raise Exception("mask", "codes")
+
+    codes = {101, 304, 401}
+    mask = problemlib.to_mask(codes)
+    if problemlib.from_mask(mask) != codes or problemlib.from_mask(mask) is not problemlib.from_mask(mask):
+        raise Exception("mask", mask)
+    if problemlib.from_mask(0) or problemlib.to_mask(()) != 0:
+        raise Exception("mask", "empty")
+
+
+def main() -> None:
+    for name, func in globals().items():
+        if name.startswith("test"):
+            func()
+
+
+try:
+    main()
+except:
+    traceback.print_exc()
+    sys.exit(1)
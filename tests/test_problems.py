@@ -30,6 +30,14 @@ def _add_mesh(location=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0)) -> Object:
     return ob
 
 
+def _add_mesh_data(verts, edges=(), faces=()) -> Object:
+    me = bpy.data.meshes.new("Mesh")
+    me.from_pydata(verts, edges, faces)
+    ob = bpy.data.objects.new("Mesh", me)
+    bpy.context.scene.collection.objects.link(ob)
+    return ob
+
+
 def test_101() -> None:
     """Scaled object"""
     _add_mesh(scale=(1.5, 1.0, 1.0))
@@ -75,6 +83,33 @@ def test_303() -> None:
     ob.modifiers.new("Curve", "CURVE").object = curve
 
 
+def test_304() -> None:
+    """Zero area faces"""
+    _add_mesh_data(((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (2.0, 0.0, 0.0)), faces=((0, 1, 2),))
+
+
+def test_305() -> None:
+    """Loose vertices"""
+    _add_mesh_data(((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (5.0, 0.0, 0.0)), faces=((0, 1, 2),))
+
+
+def test_306() -> None:
+    """Loose edges"""
+    _add_mesh_data(((0.0, 0.0, 0.0), (1.0, 0.0, 0.0)), edges=((0, 1),))
+
+
+def test_307() -> None:
+    """Coincident vertices"""
+    verts = ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0))
+    _add_mesh_data(verts, faces=((0, 1, 2), (3, 4, 2)))
+
+
+def test_308() -> None:
+    """Non-manifold edges"""
+    verts = ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, -1.0, 0.0), (0.0, 0.0, 1.0))
+    _add_mesh_data(verts, faces=((0, 1, 2), (1, 0, 3), (0, 1, 4)))
+
+
 def test_401() -> None:
     """Collection uses default name"""
     coll = bpy.data.collections.new("Collection")
@@ -98,6 +133,20 @@ def main() -> None:
     if (result := test_problems - scene_problems):
         raise Exception(result)
 
+    # Objects in Exceptions collection and its children are skipped
+    exceptions = bpy.data.collections.new("Exceptions")
+    nested = bpy.data.collections.new("Nested")
+    exceptions.children.link(nested)
+    bpy.context.scene.collection.children.link(exceptions)
+
+    for ob in bpy.context.scene.objects:
+        nested.objects.link(ob)
+
+    bpy.context.scene.sidekick.exceptions = exceptions
+    scene_problems = {x.code for x in bpy.context.window_manager.sidekick.problems(rescan=True)}
+    if (result := scene_problems - {401}):
+        raise Exception("exceptions", result)
+
 
 try:
     main()
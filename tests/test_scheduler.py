@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Refresh interval scheduling, runs in Blender or plain CPython
+# Usage: blender -b -P test_scheduler.py
+#        python test_scheduler.py
+
+import sys
+import traceback
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+
+(scheduler,) = addon.modules("scheduler")
+Scheduler = scheduler.Scheduler
+
+
+def test_backoff() -> None:
+    schedule = Scheduler()
+    intervals = [schedule.next(0.0, False, 0.5) for _ in range(6)]
+
+    if intervals != [2.0, 4.0, 8.0, 16.0, 16.0, 16.0] or scheduler.INTERVAL_MAX != 16.0:
+        raise Exception("backoff", intervals)
+    if not schedule.is_idle:
+        raise Exception("backoff", "idle")
+
+    # Scene activity and pause return to minimal interval
+    if schedule.next(0.0, True, 0.5) != scheduler.INTERVAL_MIN or schedule.is_idle:
+        raise Exception("backoff", "active")
+
+    schedule.next(0.0, False, 0.5)
+    if schedule.pause() != scheduler.INTERVAL_MIN or not schedule.paused:
+        raise Exception("backoff", "pause")
+    if schedule.next(0.0, False, 0.5) != 2.0 or schedule.paused:
+        raise Exception("backoff", "resume")
+
+
+def test_pending() -> None:
+    schedule = Scheduler()
+
+    if schedule.next(0.0, False, 0.5, pending=True) != scheduler.INTERVAL_SLICE:
+        raise Exception("pending", schedule.interval)
+
+    # Slice interval is stretched when slices take longer than duty allows
+    if schedule.next(0.05, True, 0.5, pending=True) != 0.05:
+        raise Exception("pending", schedule.interval)
+
+
+def test_duty() -> None:
+    for duty_max in (0.05, 0.25, 0.5, 1.0):
+        for duration in (0.0, 0.001, 0.02, 0.5, 3.0, 40.0):
+            for active, pending in ((False, False), (True, False), (False, True)):
+                schedule = Scheduler()
+                interval = schedule.next(duration, active, duty_max, pending)
+
+                if duration and duration / (duration + interval) > duty_max + 1e-9:
+                    raise Exception("duty", duty_max, duration, interval)
+                if schedule.duty > duty_max + 1e-9:
+                    raise Exception("duty", schedule.duty)
+
+
+def test_reset() -> None:
+    # Interval stretched by duty limit is not idle and is kept on reset
+    schedule = Scheduler()
+    if schedule.next(0.5, True, 0.2) != 2.0 or schedule.is_idle:
+        raise Exception("reset", schedule.interval)
+
+    schedule.reset()
+    if schedule.interval != 2.0:
+        raise Exception("reset", schedule.interval)
+
+    # Only backoff is undone
+    schedule.next(0.5, False, 0.2)
+    schedule.next(0.5, False, 0.2)
+    if schedule.interval != 4.0 or not schedule.is_idle:
+        raise Exception("reset", "backoff", schedule.interval)
+
+    schedule.reset()
+    if schedule.interval != 2.0 or schedule.is_idle:
+        raise Exception("reset", "duty", schedule.interval)
+
+    if schedule.suspend() != scheduler.INTERVAL_MAX or not schedule.is_idle:
+        raise Exception("reset", "suspend")
+
+
+def main() -> None:
+    for name, func in globals().items():
+        if name.startswith("test"):
+            func()
+
+
+try:
+    main()
+except:
+    traceback.print_exc()
+    sys.exit(1)
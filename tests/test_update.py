@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2025 Mikhail Rachinskiy
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Incremental update driven by depsgraph handler must match full rescan
+# Usage: blender -b -P test_update.py
+
+import sys
+import traceback
+from collections.abc import Hashable
+from pathlib import Path
+
+import bpy
+from bpy.types import Object
+
+sys.path.append(str(Path(__file__).parent))
+import addon
+
+
+var, report = addon.modules("var", "report")
+
+
+def _add_curve(radius=1.0) -> Object:
+    bpy.ops.curve.primitive_nurbs_path_add()
+    ob = bpy.context.object
+    for p in ob.data.splines[0].points:
+        p.radius = radius
+    return ob
+
+
+def _add_mesh(location=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0)) -> Object:
+    bpy.ops.mesh.primitive_cube_add(location=location)
+    ob = bpy.context.object
+    ob.scale = scale
+    return ob
+
+
+def _state() -> Hashable:
+    return (
+        tuple(x.code for x in var.Report.problems),
+        tuple(sorted((name, tuple(sorted(codes))) for name, codes in var.Report.obs)),
+        tuple(sorted(var.Report.counts.items())),
+    )
+
+
+def _passes(name: str) -> int:
+    return counter.count if (counter := var.Report.stats.passes.get(name)) is not None else 0
+
+
+def _update(is_incremental: bool = True) -> dict[int, int]:
+    """Fire depsgraph handler, process changes and compare result with full rescan"""
+    updates = _passes("update")
+    scans = _passes("prepass")
+
+    bpy.context.view_layer.update()
+    var.Report.update()
+    while var.Report.progress is not None:
+        var.Report.update()
+
+    if is_incremental and (_passes("update") == updates or _passes("prepass") != scans):
+        raise Exception("incremental", updates, scans)
+    if not is_incremental and _passes("prepass") == scans:
+        raise Exception("full", scans)
+
+    result = _state()
+    bpy.context.window_manager.sidekick.problems(rescan=True)
+    if result != (expected := _state()):
+        raise Exception(result, expected)
+
+    return var.Report.counts
+
+
+def main() -> None:
+    bpy.context.preferences.addons[var.__package__].preferences.use_stats = True
+
+    curve_low = _add_curve(radius=1.0)
+    curve_high = _add_curve(radius=1.5)
+    user = _add_mesh()
+    user.modifiers.new("Curve", "CURVE").object = curve_low
+
+    a = _add_mesh(location=(0.0, 0.0, 3.0), scale=(0.5, 0.5, 0.5))
+    b = _add_mesh(location=(0.0, 0.0, 3.0))
+    a.modifiers.new("Project", "SHRINKWRAP").target = b
+    b.modifiers.new("Bool", "BOOLEAN").object = a
+
+    bpy.context.window_manager.sidekick.problems(rescan=True)
+    if 202 not in var.Report.counts or 301 in var.Report.counts:
+        raise Exception("initial", var.Report.counts)
+
+    user.modifiers["Curve"].object = curve_high
+    if 301 not in _update():
+        raise Exception("retarget")
+
+    user.modifiers.new("Subd", "SUBSURF")
+    if 201 not in _update():
+        raise Exception("order")
+
+    # Deformed object is queued when curve data changes
+    for p in curve_high.data.splines[0].points:
+        p.radius = 1.0
+    if 301 in _update():
+        raise Exception("radius")
+
+    # Both cycle members are queued when one of them leaves the cycle
+    b.modifiers["Bool"].object = None
+    if 202 in _update():
+        raise Exception("cycle")
+
+    # Results of the whole file are dropped on scene changes
+    bpy.context.window_manager.sidekick.problems_file()
+    user.location.x += 1.0
+    _update()
+    if var.Report.file:
+        raise Exception("file")
+
+    # Renamed object is still resolved on its next update
+    user.name = "Renamed"
+    user.location.x += 1.0
+    _update()
+    if "Renamed" not in {name for name, _ in var.Report.obs}:
+        raise Exception("rename", var.Report.obs)
+
+    # Past dirty limit full scan is restarted instead
+    for i in range(report._DIRTY_LIMIT + 1):
+        ob = bpy.data.objects.new(f"Empty.{i}", None)
+        bpy.context.scene.collection.objects.link(ob)
+        ob.location.x = i
+    _update(is_incremental=False)
+
+
+try:
+    main()
+except:
+    traceback.print_exc()
+    sys.exit(1)